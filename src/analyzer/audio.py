@@ -3,6 +3,7 @@ Audio extraction module for MVP Analyzer.
 """
 
 import logging
+import shlex
 import subprocess
 import tempfile
 from pathlib import Path
@@ -77,6 +78,11 @@ class AudioExtractor:
         """
         cmd = [
             "ffmpeg",
+            "-hide_banner",
+            "-loglevel",
+            "error",  # Only report errors
+            "-nostats",  # No periodic encoding stats on stderr
+            "-nostdin",
             "-i",
             str(input_path),
             "-vn",  # No video
@@ -90,7 +96,8 @@ class AudioExtractor:
             str(output_path),
         ]
 
-        logger.debug(f"Running ffmpeg command: {' '.join(cmd)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Running ffmpeg command: {shlex.join(cmd)}")
 
         try:
             subprocess.run(cmd, capture_output=True, text=True, check=True)
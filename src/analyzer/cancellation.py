@@ -4,10 +4,12 @@ Handles signal processing, process cleanup, and resource management.
 """
 
 import logging
+import shlex
 import signal
 import subprocess
 import threading
 import time
+from collections.abc import Callable
 from contextlib import contextmanager
 from typing import Any
 
@@ -44,6 +46,11 @@ class ResourceManager:
         """
         self._cancellation_manager = cancellation_manager
 
+    @property
+    def cancellation_manager(self) -> "CancellationManager | None":
+        """Cancellation manager wired to this resource manager, if any."""
+        return self._cancellation_manager
+
     def _parse_ram_limit(self, ram_limit: str | None) -> int | None:
         """
         Parse RAM limit string to bytes.
@@ -198,6 +205,7 @@ class CancellationManager:
         self.resource_manager = resource_manager
         self.cancelled = False
         self._original_signal_handlers = {}
+        self._cancel_callbacks: list[Callable[[], None]] = []
         self._lock = threading.Lock()
 
     def setup_signal_handlers(self) -> None:
@@ -205,7 +213,12 @@ class CancellationManager:
 
         def signal_handler(signum, frame):
             logger.info(f"Received signal {signum}, initiating graceful shutdown...")
-            self.cancel()
+            # Only mark cancellation here: cancel() takes a lock the
+            # interrupted code may hold and waits for process cleanup, which
+            # managed_resources does on exit. Raising stops the work in
+            # progress for both Ctrl-C and termination requests.
+            self.cancelled = True
+            raise KeyboardInterrupt("Operation cancelled")
 
         # Store original handlers
         self._original_signal_handlers[signal.SIGTERM] = signal.signal(
@@ -224,6 +237,16 @@ class CancellationManager:
 
         logger.debug("Signal handlers restored")
 
+    def add_cancel_callback(self, callback: Callable[[], None]) -> None:
+        """
+        Register a callback to run when cancellation is requested.
+
+        Args:
+            callback: Function called once, without arguments, on cancel()
+        """
+        with self._lock:
+            self._cancel_callbacks.append(callback)
+
     def cancel(self) -> bool:
         """
         Cancel the current operation.
@@ -236,8 +259,16 @@ class CancellationManager:
                 return True
 
             self.cancelled = True
+            callbacks = list(self._cancel_callbacks)
             logger.info("Cancellation requested")
 
+        # Let components stop the work they manage themselves
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Cancel callback failed: {e}")
+
         # Clean up processes
         success = self.resource_manager.cleanup_processes(timeout=5.0)
 
@@ -340,7 +371,8 @@ class ProcessMonitor:
         try:
             process = subprocess.Popen(cmd, **default_kwargs)
             self.resource_manager.register_process(process)
-            logger.debug(f"Started subprocess {process.pid}: {' '.join(cmd)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Started subprocess {process.pid}: {shlex.join(cmd)}")
             return process
         except Exception as e:
             logger.error(f"Failed to start subprocess: {e}")
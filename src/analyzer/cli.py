@@ -10,6 +10,7 @@ import click
 from rich.console import Console
 from rich.logging import RichHandler
 
+from .cancellation import managed_resources
 from .config import Config
 from .core import Analyzer
 
@@ -83,6 +84,16 @@ def setup_logging(verbose: bool = False) -> None:
     default="clips",
     help="Directory for exported video clips (default: clips)",
 )
+@click.option(
+    "--export-temp-dir",
+    type=click.Path(path_type=Path),
+    help="Local directory to write clips to before moving them to --export-dir",
+)
+@click.option(
+    "--reuse-clips",
+    is_flag=True,
+    help="Skip clips already exported by a previous run with the same settings",
+)
 @click.option(
     "--export-format",
     type=click.Choice(["original", "vertical", "square"]),
@@ -94,6 +105,11 @@ def setup_logging(verbose: bool = False) -> None:
     is_flag=True,
     help="Enable auto-reframe using people detection for vertical/square formats",
 )
+@click.option(
+    "--nvenc",
+    is_flag=True,
+    help="Use NVIDIA NVENC hardware encoding for h264 when available",
+)
 @click.option(
     "--metrics",
     type=click.Path(path_type=Path),
@@ -119,8 +135,11 @@ def main(
     ram_limit: str | None,
     export_video: bool,
     export_dir: Path,
+    export_temp_dir: Path | None,
+    reuse_clips: bool,
     export_format: str,
     auto_reframe: bool,
+    nvenc: bool,
     metrics: Path | None,
     progress_events: bool,
 ) -> None:
@@ -167,8 +186,11 @@ def main(
             align_to_beat=align_to_beat,
             export_video=export_video,
             export_dir=export_dir,
+            export_temp_dir=export_temp_dir,
+            reuse_exported_clips=reuse_clips,
             export_format=export_format,
             auto_reframe=auto_reframe,
+            use_nvenc=nvenc,
             seed_timestamps=seed_timestamps,
             output_json=out_json,
             output_csv=out_csv,
@@ -177,9 +199,6 @@ def main(
             progress_events=progress_events,
         )
 
-        # Create and run analyzer
-        analyzer = Analyzer(config)
-
         console.print(f"[bold green]Starting analysis of {video_path}[/bold green]")
         console.print("[blue]Configuration:[/blue]")
         console.print(f"  • Clips: {clips}")
@@ -193,11 +212,15 @@ def main(
             console.print(f"  • Export directory: {export_dir}")
             console.print(f"  • Export format: {export_format}")
             console.print(f"  • Auto-reframe: {'Yes' if auto_reframe else 'No'}")
+            console.print(f"  • NVENC: {'Yes' if nvenc else 'No'}")
         if seed_timestamps:
             console.print(f"  • Seeds: {len(seed_timestamps)} timestamps")
 
-        # Run analysis
-        results = analyzer.analyze()
+        # Create and run analyzer; SIGINT/SIGTERM interrupt any stage, and
+        # a running video export also stops its FFmpeg processes
+        with managed_resources(threads, ram_limit) as resource_manager:
+            analyzer = Analyzer(config, resource_manager.cancellation_manager)
+            results = analyzer.analyze()
 
         console.print("[bold green]✓ Analysis completed![/bold green]")
         console.print("[blue]Results saved to:[/blue]")
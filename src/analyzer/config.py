@@ -50,6 +50,16 @@ class Config(BaseModel):
     export_dir: Path = Field(
         default=Path("clips"), description="Directory for exported video clips"
     )
+    export_temp_dir: Path | None = Field(
+        default=None,
+        description="Local directory FFmpeg writes clips to before they are moved "
+        "into export_dir (default: stage next to the final clip)",
+    )
+    reuse_exported_clips: bool = Field(
+        default=False,
+        description="Skip clips already exported by a previous run with the "
+        "same input, clip times and export settings",
+    )
     export_format: str = Field(
         default="original", description="Export format: original, vertical, or square"
     )
@@ -84,6 +94,11 @@ class Config(BaseModel):
     debug_tracking: bool = Field(
         default=False, description="Enable debug visualization of object tracking"
     )
+    crop_interp_points: int = Field(
+        default=10,
+        ge=2,
+        description="Tracking positions sampled per clip for dynamic cropping",
+    )
 
     # Seed timestamps (in seconds)
     seed_timestamps: list[float] = Field(
@@ -95,6 +110,49 @@ class Config(BaseModel):
         default=None, ge=1, description="Number of threads to use"
     )
     ram_limit: str | None = Field(default=None, description="RAM limit (e.g., '2GB')")
+    keyframe_tolerance: float = Field(
+        default=3.0,
+        ge=0,
+        description="Maximum seconds a stream-copied clip may start before the "
+        "requested time (nearest preceding keyframe); farther clips are transcoded",
+    )
+    x264_preset: str = Field(
+        default="veryfast",
+        pattern=r"^(ultrafast|superfast|veryfast|faster|fast|medium|slow|slower"
+        r"|veryslow|placebo)$",
+        description="libx264 preset trading encode speed for compression",
+    )
+    x264_tune: str | None = Field(
+        default=None,
+        pattern=r"^(film|animation|grain|stillimage|fastdecode|zerolatency"
+        r"|psnr|ssim)$",
+        description="Optional libx264 tune, e.g. fastdecode or zerolatency",
+    )
+    use_nvenc: bool = Field(
+        default=False,
+        description="Use NVIDIA NVENC hardware encoding for h264 when available",
+    )
+    nvenc_preset: str = Field(
+        default="p4",
+        pattern=r"^p[1-7]$",
+        description="NVENC preset from p1 (fastest) to p7 (best quality)",
+    )
+    nvenc_cq: int = Field(
+        default=20,
+        ge=0,
+        le=51,
+        description="NVENC constant quality level (lower is better quality)",
+    )
+    export_parallelism: int | None = Field(
+        default=None,
+        ge=1,
+        description="Number of clips to export concurrently (default: auto)",
+    )
+    pin_export_workers: bool = Field(
+        default=False,
+        description="Pin each parallel export worker's FFmpeg to its own CPU "
+        "cores (Linux only)",
+    )
 
     @field_validator("max_clip_length")
     @classmethod
@@ -7,6 +7,7 @@ from typing import Any
 
 from .audio import AudioExtractor
 from .beats import BeatQuantizer, BeatTracker
+from .cancellation import CancellationManager
 from .config import Config
 from .export import ResultExporter
 from .metrics import AnalysisStage as MetricsStage
@@ -25,9 +26,21 @@ logger = logging.getLogger(__name__)
 class Analyzer:
     """Main analyzer class that orchestrates the analysis pipeline."""
 
-    def __init__(self, config: Config):
-        """Initialize the analyzer with configuration."""
+    def __init__(
+        self,
+        config: Config,
+        cancellation_manager: CancellationManager | None = None,
+    ):
+        """
+        Initialize the analyzer with configuration.
+
+        Args:
+            config: Analysis configuration
+            cancellation_manager: Optional cancellation manager whose cancel()
+                also stops a running video export
+        """
         self.config = config
+        self.cancellation_manager = cancellation_manager
 
         # Initialize metrics collector
         self.metrics_collector = MetricsCollector()
@@ -54,6 +67,8 @@ class Analyzer:
         # Initialize video exporter if enabled
         if config.export_video:
             self.video_exporter = VideoExporter(config)
+            if cancellation_manager:
+                cancellation_manager.add_cancel_callback(self.video_exporter.cancel)
         else:
             self.video_exporter = None
 
@@ -196,6 +211,8 @@ class Analyzer:
 
             # Step 9: Video export (if enabled)
             if self.video_exporter:
+                if self.cancellation_manager:
+                    self.cancellation_manager.check_cancellation()
                 logger.info("Step 9: Exporting video clips")
                 self.progress_emitter.start_stage(ProgressStage.VIDEO_EXPORT)
                 self.metrics_collector.start_stage(MetricsStage.VIDEO_EXPORT)
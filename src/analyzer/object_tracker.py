@@ -483,7 +483,7 @@ class ObjectTracker:
         }
 
     def interpolate_to_export_timeline(
-        self, tracking_data: dict[str, Any], export_times: np.ndarray
+        self, tracking_data: dict[str, Any], export_times: np.ndarray | list[float]
     ) -> list[tuple[int, int]]:
         """
         Interpolate tracking positions to match export timeline.
@@ -4,6 +4,7 @@ JSON Schema validation module for MVP Analyzer.
 This module provides JSON schema validation for analyzer output files.
 """
 
+import csv
 import json
 import logging
 from pathlib import Path
@@ -152,8 +153,6 @@ class JSONSchemaValidator:
             return False
 
         try:
-            import csv
-
             with open(csv_path) as f:
                 reader = csv.DictReader(f)
 
@@ -4,8 +4,22 @@ Video export module for MVP Analyzer.
 This module handles video clip export functionality.
 """
 
+import collections
+import functools
+import hashlib
+import json
 import logging
+import os
+import queue
+import shlex
+import shutil
+import signal
+import struct
 import subprocess
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -16,6 +30,314 @@ from .people_detector import PeopleDetector
 
 logger = logging.getLogger(__name__)
 
+# Codecs that can be stream copied into an MP4 clip without re-encoding
+STREAM_COPY_VIDEO_CODECS = frozenset({"h264"})
+STREAM_COPY_AUDIO_CODECS = frozenset({"aac", "mp3"})
+
+# Config fields that change an exported clip, part of the export cache key
+EXPORT_CACHE_CONFIG_FIELDS = frozenset(
+    {
+        "export_format",
+        "auto_reframe",
+        "enable_object_tracking",
+        "tracking_smoothness",
+        "tracking_confidence_threshold",
+        "fallback_to_center",
+        "crop_interp_points",
+        "keyframe_tolerance",
+        "x264_preset",
+        "x264_tune",
+        "nvenc_preset",
+        "nvenc_cq",
+    }
+)
+
+# Sample rates at which AAC input audio is copied into transcoded clips
+# instead of being re-encoded
+AUDIO_COPY_SAMPLE_RATES = frozenset({44100, 48000})
+
+# ffprobe fields collected by VideoExporter.get_video_info
+PROBE_ENTRIES = (
+    "stream=codec_type,codec_name,width,height,avg_frame_rate,sample_rate,"
+    "sample_aspect_ratio:stream_tags=rotate:stream_side_data=rotation"
+    ":format=duration,start_time"
+)
+
+
+# Maximum number of clips stream copied by a single FFmpeg process
+STREAM_COPY_BATCH_SIZE = 16
+
+# Maximum number of clips transcoded by a single FFmpeg process; smaller than
+# stream copy batches since a failed batch is re-encoded clip by clip
+TRANSCODE_BATCH_SIZE = 8
+
+# Number of trailing FFmpeg stderr lines kept for error reporting
+STDERR_TAIL_LINES = 200
+
+# Read buffer for FFmpeg output pipes; lines are read from the buffer instead
+# of with one read() syscall per byte as on an unbuffered pipe
+FFMPEG_PIPE_BUFFER_SIZE = 1 << 20
+
+# Default number of concurrent exports when encoding with NVENC; consumer
+# GPUs only allow a few simultaneous encode sessions
+NVENC_MAX_WORKERS = 2
+
+# Minimum seconds between progress log lines of one FFmpeg process
+PROGRESS_LOG_INTERVAL = 5.0
+
+# Seconds between cancellation checks while waiting for FFmpeg
+CANCEL_POLL_INTERVAL = 0.2
+
+
+def _run_ffmpeg(
+    cmd: list[str],
+    timeout: float,
+    duration: float | None = None,
+    cancel_event: threading.Event | None = None,
+    label: str | None = None,
+) -> subprocess.CompletedProcess:
+    """
+    Run an FFmpeg command, keeping only the tail of its stderr.
+
+    stderr is drained by a background thread into a bounded buffer, so
+    verbose runs cannot grow memory without limit, and it is only decoded
+    when the command fails.
+
+    FFmpeg runs in its own session, so on timeout, cancellation or
+    interruption the whole process group is killed, including any helper
+    processes it started.
+
+    Args:
+        cmd: FFmpeg command line
+        timeout: Maximum time to wait in seconds
+        duration: Output duration in seconds; when given, ``-progress pipe:1``
+            reports on stdout are read and logged as percent complete
+        cancel_event: Event that stops FFmpeg when set
+        label: Name used in progress log messages (default: output file name)
+
+    Returns:
+        CompletedProcess with decoded stderr tail (empty on success)
+
+    Raises:
+        subprocess.TimeoutExpired: If FFmpeg does not finish in time
+        KeyboardInterrupt: If cancel_event is set before FFmpeg finishes
+    """
+    if cancel_event is not None and cancel_event.is_set():
+        raise KeyboardInterrupt("Operation cancelled")
+
+    # Joining the command line is only worth it when it will be logged
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Running FFmpeg command: {shlex.join(cmd)}")
+
+    process = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE if duration else subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        bufsize=FFMPEG_PIPE_BUFFER_SIZE,
+        start_new_session=True,
+    )
+    stderr_pipe = process.stderr
+    assert stderr_pipe is not None
+    stderr_tail: collections.deque[bytes] = collections.deque(maxlen=STDERR_TAIL_LINES)
+
+    def drain_stderr() -> None:
+        for line in stderr_pipe:
+            stderr_tail.append(line)
+
+    reader_threads = [threading.Thread(target=drain_stderr, daemon=True)]
+    if duration:
+        reader_threads.append(
+            threading.Thread(
+                target=_log_progress,
+                args=(process.stdout, duration, label or Path(cmd[-1]).name),
+                daemon=True,
+            )
+        )
+    for thread in reader_threads:
+        thread.start()
+
+    try:
+        returncode = _wait_for_ffmpeg(process, timeout, cancel_event)
+    except BaseException:
+        # Also covers KeyboardInterrupt: FFmpeg is outside the terminal's
+        # process group and would otherwise keep running
+        _kill_process_group(process)
+        process.wait()
+        raise
+    finally:
+        for thread in reader_threads:
+            thread.join()
+        stderr_pipe.close()
+        if process.stdout:
+            process.stdout.close()
+
+    stderr = ""
+    if returncode != 0:
+        stderr = b"".join(stderr_tail).decode("utf-8", "replace")
+
+    return subprocess.CompletedProcess(cmd, returncode, stderr=stderr)
+
+
+def _wait_for_ffmpeg(
+    process: subprocess.Popen,
+    timeout: float,
+    cancel_event: threading.Event | None,
+) -> int:
+    """
+    Wait for FFmpeg to exit, checking for cancellation while waiting.
+
+    Args:
+        process: Running FFmpeg process
+        timeout: Maximum time to wait in seconds
+        cancel_event: Event that stops waiting when set
+
+    Returns:
+        FFmpeg exit code
+
+    Raises:
+        subprocess.TimeoutExpired: If FFmpeg does not finish in time
+        KeyboardInterrupt: If cancel_event is set before FFmpeg finishes
+    """
+    if cancel_event is None:
+        return process.wait(timeout=timeout)
+
+    deadline = time.monotonic() + timeout
+    while not cancel_event.is_set():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise subprocess.TimeoutExpired(process.args, timeout)
+        try:
+            return process.wait(timeout=min(remaining, CANCEL_POLL_INTERVAL))
+        except subprocess.TimeoutExpired:
+            continue
+
+    raise KeyboardInterrupt("Operation cancelled")
+
+
+def _log_progress(stream: Any, duration: float, name: str) -> None:
+    """
+    Log FFmpeg ``-progress`` reports as percent of the output duration.
+
+    Args:
+        stream: FFmpeg stdout carrying key=value progress lines
+        duration: Output duration in seconds
+        name: Clip name used in log messages
+    """
+    last_logged = 0.0
+    for line in stream:
+        key, _, value = line.decode("ascii", "replace").strip().partition("=")
+        # out_time_ms is in microseconds as well; older FFmpeg only emits it
+        if key not in ("out_time_us", "out_time_ms") or not value.isdigit():
+            continue
+
+        now = time.monotonic()
+        if now - last_logged >= PROGRESS_LOG_INTERVAL:
+            last_logged = now
+            percent = min(100.0, int(value) / (duration * 1e6) * 100)
+            logger.info(f"{name}: {percent:.0f}% exported")
+
+
+def _kill_process_group(process: subprocess.Popen) -> None:
+    """Kill a process started with start_new_session and its children."""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, ProcessLookupError):
+        # No process groups on this platform, or the group already exited
+        process.kill()
+
+
+def _output_size(path: Path) -> int | None:
+    """Return the size of an FFmpeg output file, or None if it was not written."""
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return None
+
+
+def _is_faststart_mp4(path: Path) -> bool:
+    """
+    Check whether an MP4 file has its moov box before its media data.
+
+    Only the top-level box headers are read, so this is cheap even for
+    large files.
+
+    Args:
+        path: Path to MP4 file
+
+    Returns:
+        True if moov precedes mdat, False otherwise or if unreadable
+    """
+    try:
+        with open(path, "rb") as f:
+            while header := f.read(8):
+                if len(header) < 8:
+                    return False
+                size, box_type = struct.unpack(">I4s", header)
+                if box_type == b"moov":
+                    return True
+                if box_type == b"mdat":
+                    return False
+                if size == 1:
+                    # 64-bit size follows the box type
+                    large_size = f.read(8)
+                    if len(large_size) < 8:
+                        return False
+                    size = struct.unpack(">Q", large_size)[0] - 8
+                if size < 8:
+                    # Zero (box runs to EOF) or a corrupt size
+                    return False
+                f.seek(size - 8, os.SEEK_CUR)
+    except OSError:
+        return False
+    return False
+
+
+@functools.cache
+def _detect_nvenc() -> bool:
+    """
+    Check whether h264_nvenc can actually encode on this machine.
+
+    Stock FFmpeg builds list h264_nvenc even without an NVIDIA GPU or
+    driver, so a single test frame is encoded instead of trusting
+    ``ffmpeg -encoders``. The result is cached for the lifetime of the
+    process.
+
+    Returns:
+        True if a one-frame h264_nvenc test encode succeeds
+    """
+    try:
+        result = subprocess.run(
+            [
+                "ffmpeg",
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-nostdin",
+                "-f",
+                "lavfi",
+                "-i",
+                "nullsrc=s=256x256",
+                "-frames:v",
+                "1",
+                "-c:v",
+                "h264_nvenc",
+                "-f",
+                "null",
+                "-",
+            ],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+    except Exception as e:
+        logger.debug(f"Failed to run NVENC test encode: {e}")
+        return False
+
+    if result.returncode != 0:
+        logger.debug(f"NVENC test encode failed: {result.stderr.strip()}")
+        return False
+    return True
+
 
 class VideoExporter:
     """Exports video clips based on analysis results."""
@@ -38,6 +360,22 @@ class VideoExporter:
             self.object_tracker = None
             self.dynamic_cropper = None
 
+        # Global FFmpeg parameters: no banner, errors only, no periodic stats
+        # line (printed to stderr regardless of -loglevel), never read stdin
+        self.ffmpeg_global_params = [
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-nostats",
+            "-nostdin",
+        ]
+
+        # Machine-readable progress reports on stdout for per-clip commands
+        self.progress_params = ["-progress", "pipe:1", "-stats_period", "0.5"]
+
+        # Set by cancel() to stop running and pending FFmpeg exports
+        self.cancel_event = threading.Event()
+
         # Format definitions
         self.formats = {
             "original": {"width": None, "height": None, "crop": False},
@@ -45,6 +383,13 @@ class VideoExporter:
             "square": {"width": 1080, "height": 1080, "crop": True},  # 1:1
         }
 
+        # Clip filename ending, e.g. "_vertical.mp4"; the format never changes
+        # per clip, so it is built once instead of for every exported segment
+        format_suffix = (
+            f"_{config.export_format}" if config.export_format != "original" else ""
+        )
+        self._clip_suffix = f"{format_suffix}.mp4"
+
         # FFmpeg parameters for h264 transcoding
         self.h264_params = [
             "-c:v",
@@ -52,14 +397,85 @@ class VideoExporter:
             "-crf",
             "18",
             "-preset",
-            "veryfast",
+            config.x264_preset,
             "-pix_fmt",
             "yuv420p",
         ]
+        if config.x264_tune:
+            self.h264_params.extend(["-tune", config.x264_tune])
+
+        # Input parameters for hardware decoding (empty for software decoding):
+        # hwaccel_params keep decoded frames on the GPU, hwdecode_params copy
+        # them back to system memory for CPU filters such as crop
+        self.hwaccel_params = []
+        self.hwdecode_params = []
+
+        # Use NVENC encoding with CUDA decoding when requested and available
+        self.use_nvenc = config.use_nvenc and _detect_nvenc()
+        if self.use_nvenc:
+            logger.info("Using NVENC hardware encoding for h264 transcoding")
+            self.hwaccel_params = [
+                "-hwaccel",
+                "cuda",
+                "-hwaccel_output_format",
+                "cuda",
+            ]
+            self.hwdecode_params = ["-hwaccel", "cuda"]
+            self.h264_params = [
+                "-c:v",
+                "h264_nvenc",
+                "-preset",
+                config.nvenc_preset,
+                "-tune",
+                "hq",
+                "-rc",
+                "vbr",
+                "-cq",
+                str(config.nvenc_cq),
+                "-b:v",
+                "0",
+                "-bf",
+                "0",  # No B-frames, avoids running out of decoder surfaces
+            ]
+        else:
+            if config.use_nvenc:
+                logger.warning(
+                    "NVENC requested but h264_nvenc is unavailable, using libx264"
+                )
+            logger.info(
+                f"Using libx264 preset {config.x264_preset}"
+                + (f", tune {config.x264_tune}" if config.x264_tune else "")
+                + " for h264 transcoding"
+            )
 
         # Audio codec parameters
         self.audio_params = ["-c:a", "aac", "-b:a", "128k"]
 
+        # MP4 container parameters for all clips: move the moov atom to the
+        # front so clips are upload/stream ready without a second pass
+        self.mp4_params = ["-movflags", "+faststart"]
+
+        # Encoder threads per FFmpeg process (0 lets FFmpeg decide); set per
+        # export from the CPU budget and the number of parallel workers
+        self._ffmpeg_threads = 0
+
+        # ffprobe results keyed by (resolved path, mtime) of the probed file
+        self._probe_cache: dict[tuple[str, int], dict[str, Any]] = {}
+
+        # Prefix of staged clip names, unique per exporter so runs sharing an
+        # export_temp_dir never write to each other's staging files
+        self._staging_prefix = f".{uuid.uuid4().hex[:12]}."
+
+    def cancel(self) -> None:
+        """
+        Cancel the export in progress.
+
+        Running FFmpeg processes are killed and the export raises
+        KeyboardInterrupt, matching CancellationManager.check_cancellation.
+        The next export_clips call starts uncancelled again.
+        """
+        self.cancel_event.set()
+
     def export_clips(
         self, segments_data: dict[str, Any], input_video_path: Path, output_dir: Path
     ) -> dict[str, Any]:
@@ -76,12 +492,27 @@ class VideoExporter:
         """
         logger.info(f"Starting video export for {len(segments_data['segments'])} clips")
 
-        # Ensure output directory exists
+        # A cancel() of a previous export must not stop this one
+        self.cancel_event.clear()
+
+        # Ensure output and staging directories exist
         output_dir.mkdir(parents=True, exist_ok=True)
+        if self.config.export_temp_dir:
+            self.config.export_temp_dir.mkdir(parents=True, exist_ok=True)
+
+        segments = segments_data["segments"]
+
+        # Clips left unchanged by a previous run are reused as they are
+        results: list[tuple[dict[str, Any] | None, dict[str, Any] | None] | None]
+        results = [
+            self._load_cached_export(segment, input_video_path, output_dir)
+            for segment in segments
+        ]
+        pending = [i for i, result in enumerate(results) if result is None]
 
         # Perform object tracking analysis if enabled
         tracking_data = None
-        if self.config.enable_object_tracking and self.object_tracker:
+        if pending and self.config.enable_object_tracking and self.object_tracker:
             logger.info("Performing object tracking analysis for dynamic cropping")
             tracking_data = self.object_tracker.analyze_video_tracking(input_video_path)
 
@@ -102,64 +533,111 @@ class VideoExporter:
                     m.get("processing_time_sec", 0.0),
                 )
 
-        exported_clips = []
-        export_errors = []
-
-        for _i, segment in enumerate(segments_data["segments"]):
-            clip_id = segment["clip_id"]
-            start_time = segment["start"]
-            end_time = segment["end"]
-
-            logger.info(
-                f"Exporting clip {clip_id}: {start_time:.2f}s - {end_time:.2f}s"
-            )
+        # Probe the input once up front; clip exports running in parallel
+        # then share the cached codecs and dimensions instead of re-probing
+        if pending:
+            self.get_video_info(input_video_path)
+
+        # Clips with incompatible codecs skip straight to transcoding instead
+        # of failing a stream copy first. Vertical/square exports of a source
+        # already at the target size need no filter and are copied as well
+        copy_starts: list[float | None] = [None] * len(segments)
+        if pending and (
+            self.config.export_format == "original"
+            or self._matches_export_format(input_video_path)
+        ):
+            compat = self.is_codec_compatible(input_video_path)
+            if compat["compatible"]:
+                planned = self._plan_stream_copy(
+                    input_video_path, [segments[i] for i in pending]
+                )
+                for i, copy_start in zip(pending, planned, strict=True):
+                    copy_starts[i] = copy_start
+            else:
+                logger.info(
+                    f"Input codecs ({compat['video_codec']}/{compat['audio_codec']}) "
+                    "not stream-copyable, transcoding all clips to h264"
+                )
 
-            # Generate output filename with format suffix
-            format_suffix = (
-                f"_{self.config.export_format}"
-                if self.config.export_format != "original"
-                else ""
+        # Stream copies are I/O bound and dominated by FFmpeg startup, so cut
+        # them in a few multi-output processes before going clip by clip.
+        # Batches are bounded so one failure only sends a few clips back to
+        # single exports and each process keeps a small number of inputs open
+        copy_indices = [i for i in pending if copy_starts[i] is not None]
+        for offset in range(0, len(copy_indices), STREAM_COPY_BATCH_SIZE):
+            batch_indices = copy_indices[offset : offset + STREAM_COPY_BATCH_SIZE]
+            if len(batch_indices) < 2:
+                continue
+            batch_results = self._stream_copy_segments_batch(
+                [segments[i] for i in batch_indices],
+                input_video_path,
+                output_dir,
+                [copy_starts[i] for i in batch_indices],
             )
-            output_filename = f"clip_{clip_id:03d}_{start_time:.1f}s-{end_time:.1f}s{format_suffix}.mp4"
-            output_path = output_dir / output_filename
-
-            try:
-                # Export single clip
-                export_result = self._export_single_clip(
-                    input_video_path, output_path, start_time, end_time, tracking_data
+            if batch_results is not None:
+                for i, result in zip(batch_indices, batch_results, strict=True):
+                    results[i] = result
+
+        # When the automatic worker count leaves a single export worker (a
+        # small CPU budget), batch transcodes to pay process startup and
+        # input probing once, unless each clip needs its own filter. The
+        # outputs of one process encode concurrently, not one after another,
+        # so the CPU budget is split between them. An explicit
+        # export_parallelism always gets one FFmpeg per clip.
+        transcode_indices = [
+            i
+            for i, result in enumerate(results)
+            if result is None and copy_starts[i] is None
+        ]
+        if (
+            len(transcode_indices) > 1
+            and not self.config.export_parallelism
+            and self._get_export_workers(len(transcode_indices)) == 1
+            and not self._uses_per_clip_filters(tracking_data)
+        ):
+            # Every output of a batch opens its own encoder, so under NVENC a
+            # batch holds no more clips than concurrent encode sessions allowed
+            batch_size = NVENC_MAX_WORKERS if self.use_nvenc else TRANSCODE_BATCH_SIZE
+            for offset in range(0, len(transcode_indices), batch_size):
+                batch_indices = transcode_indices[offset : offset + batch_size]
+                if len(batch_indices) < 2:
+                    continue
+                self._ffmpeg_threads = max(
+                    1, self._get_cpu_budget() // len(batch_indices)
+                )
+                batch_results = self._transcode_segments_batch(
+                    [segments[i] for i in batch_indices],
+                    input_video_path,
+                    output_dir,
                 )
+                if batch_results is not None:
+                    for i, result in zip(batch_indices, batch_results, strict=True):
+                        results[i] = result
+
+        remaining = [i for i, result in enumerate(results) if result is None]
+        if remaining:
+            parallel_results = self._export_segments_parallel(
+                [segments[i] for i in remaining],
+                input_video_path,
+                output_dir,
+                tracking_data,
+                [copy_starts[i] for i in remaining],
+            )
+            for i, result in zip(remaining, parallel_results, strict=True):
+                results[i] = result
 
-                if export_result["success"]:
-                    exported_clips.append(
-                        {
-                            "clip_id": clip_id,
-                            "output_path": str(output_path),
-                            "start_time": start_time,
-                            "end_time": end_time,
-                            "duration": end_time - start_time,
-                            "export_method": export_result["method"],
-                            "file_size": export_result.get("file_size", 0),
-                        }
-                    )
-                    logger.info(
-                        f"✅ Successfully exported clip {clip_id} using {export_result['method']}"
-                    )
-                else:
-                    export_errors.append(
-                        {"clip_id": clip_id, "error": export_result["error"]}
-                    )
-                    logger.error(
-                        f"❌ Failed to export clip {clip_id}: {export_result['error']}"
-                    )
+        for i in pending:
+            clip = results[i][0]
+            if clip is not None:
+                self._save_cached_export(segments[i], input_video_path, clip)
 
-            except Exception as e:
-                error_msg = f"Unexpected error exporting clip {clip_id}: {str(e)}"
-                export_errors.append({"clip_id": clip_id, "error": error_msg})
-                logger.error(f"❌ {error_msg}")
+        # Results are kept in segment order, keeping the summary deterministic
+        exported_clips = [clip for clip, _ in results if clip is not None]
+        export_errors = [error for _, error in results if error is not None]
 
         # Create export summary
         export_summary = {
-            "total_clips": len(segments_data["segments"]),
+            "total_clips": len(segments),
             "exported_clips": len(exported_clips),
             "failed_clips": len(export_errors),
             "exported_clips_list": exported_clips,
@@ -168,11 +646,542 @@ class VideoExporter:
         }
 
         logger.info(
-            f"Video export completed: {len(exported_clips)}/{len(segments_data['segments'])} clips exported successfully"
+            f"Video export completed: {len(exported_clips)}/{len(segments)} clips exported successfully"
         )
 
         return export_summary
 
+    def _get_export_cache_key(
+        self, segment: dict[str, Any], input_video_path: Path
+    ) -> str | None:
+        """
+        Get the key identifying a clip export for the export cache.
+
+        The key covers the input file and its modification time, the clip
+        times and every setting that changes the exported clip.
+
+        Args:
+            segment: Segment with clip_id, start and end times
+            input_video_path: Path to input video file
+
+        Returns:
+            Hex digest of the export inputs, or None if the input is missing
+        """
+        try:
+            input_stat = input_video_path.stat()
+        except OSError:
+            return None
+
+        payload = {
+            "input": str(input_video_path.resolve()),
+            "mtime_ns": input_stat.st_mtime_ns,
+            "start": segment["start"],
+            "end": segment["end"],
+            "use_nvenc": self.use_nvenc,
+            **self.config.model_dump(include=EXPORT_CACHE_CONFIG_FIELDS),
+        }
+        return hashlib.blake2b(
+            json.dumps(payload, sort_keys=True).encode(), digest_size=16
+        ).hexdigest()
+
+    def _get_export_cache_path(self, output_path: Path) -> Path:
+        """Get the export cache entry stored next to an exported clip."""
+        return output_path.with_suffix(".meta.json")
+
+    def _load_cached_export(
+        self, segment: dict[str, Any], input_video_path: Path, output_dir: Path
+    ) -> tuple[dict[str, Any], None] | None:
+        """
+        Reuse a clip exported by a previous run with identical inputs.
+
+        Args:
+            segment: Segment with clip_id, start and end times
+            input_video_path: Path to input video file
+            output_dir: Directory to save exported clips
+
+        Returns:
+            (exported clip entry, None) if the clip can be reused, else None
+        """
+        if not self.config.reuse_exported_clips:
+            return None
+
+        output_path = self._get_output_path(output_dir, segment)
+        try:
+            cached = json.loads(self._get_export_cache_path(output_path).read_text())
+        except (OSError, ValueError):
+            return None
+
+        key = self._get_export_cache_key(segment, input_video_path)
+        entry = cached.get("entry") if isinstance(cached, dict) else None
+        if (
+            key is None
+            or cached.get("key") != key
+            or not isinstance(entry, dict)
+            or _output_size(output_path) != entry.get("file_size")
+        ):
+            return None
+
+        logger.info(f"Reusing clip {segment['clip_id']} exported by a previous run")
+        return entry, None
+
+    def _save_cached_export(
+        self,
+        segment: dict[str, Any],
+        input_video_path: Path,
+        clip: dict[str, Any],
+    ) -> None:
+        """
+        Record an exported clip so later runs can reuse it.
+
+        Args:
+            segment: Segment with clip_id, start and end times
+            input_video_path: Path to input video file
+            clip: Exported clip entry
+        """
+        if not self.config.reuse_exported_clips:
+            return
+
+        key = self._get_export_cache_key(segment, input_video_path)
+        if key is None:
+            return
+
+        cache_path = self._get_export_cache_path(Path(clip["output_path"]))
+        try:
+            cache_path.write_text(json.dumps({"key": key, "entry": clip}))
+        except OSError as e:
+            logger.warning(f"Failed to write export cache entry {cache_path}: {e}")
+
+    def _uses_per_clip_filters(self, tracking_data: dict[str, Any] | None) -> bool:
+        """
+        Check whether clips get individual crop filters.
+
+        Args:
+            tracking_data: Object tracking analysis results
+
+        Returns:
+            True if dynamic cropping or auto-reframe builds a filter per clip
+        """
+        if not self.formats[self.config.export_format]["crop"]:
+            return False
+        dynamic_crop = bool(
+            self.config.enable_object_tracking
+            and tracking_data
+            and self.dynamic_cropper
+        )
+        auto_reframe = bool(self.config.auto_reframe and self.people_detector)
+        return dynamic_crop or auto_reframe
+
+    def _get_cpu_budget(self) -> int:
+        """Get the number of CPU threads available for export."""
+        return self.config.threads or os.cpu_count() or 1
+
+    def _get_export_workers(self, clips_count: int) -> int:
+        """
+        Get the number of clips to export concurrently.
+
+        Args:
+            clips_count: Number of clips to export
+
+        Returns:
+            Number of parallel export workers
+        """
+        if self.config.export_parallelism:
+            workers = self.config.export_parallelism
+        else:
+            workers = self._get_cpu_budget() // 2
+            if self.use_nvenc:
+                workers = min(workers, NVENC_MAX_WORKERS)
+        return max(1, min(workers, clips_count))
+
+    def _export_segments_parallel(
+        self,
+        segments: list[dict[str, Any]],
+        input_video_path: Path,
+        output_dir: Path,
+        tracking_data: dict[str, Any] | None,
+        copy_starts: list[float | None],
+    ) -> list[tuple[dict[str, Any] | None, dict[str, Any] | None]]:
+        """
+        Export segments one FFmpeg process per clip, several clips at a time.
+
+        Args:
+            segments: Segments with clip_id, start and end times
+            input_video_path: Path to input video file
+            output_dir: Directory to save exported clips
+            tracking_data: Object tracking analysis results
+            copy_starts: Per-segment stream copy start, None to transcode
+
+        Returns:
+            List of (exported clip entry, export error entry) in segment order
+        """
+        # Clips are independent, so run several FFmpeg processes at once and
+        # split the CPU budget between them to avoid oversubscription
+        max_workers = self._get_export_workers(len(segments))
+        self._ffmpeg_threads = max(1, self._get_cpu_budget() // max_workers)
+        logger.info(
+            f"Exporting with {max_workers} parallel workers, "
+            f"{self._ffmpeg_threads} FFmpeg threads each"
+        )
+
+        # Optionally give each worker its own contiguous set of cores so
+        # concurrent encoders do not migrate across each other's caches.
+        # The worker thread itself is pinned, so every FFmpeg it spawns
+        # inherits the mask from the start.
+        core_sets: queue.SimpleQueue[list[int]] = queue.SimpleQueue()
+        for cores in self._get_worker_core_sets(max_workers):
+            core_sets.put(cores)
+
+        def init_worker() -> None:
+            if core_sets.empty():
+                return
+            cores = core_sets.get()
+            try:
+                os.sched_setaffinity(0, cores)
+            except OSError as e:
+                logger.debug(f"Failed to pin export worker to cores {cores}: {e}")
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers, initializer=init_worker
+        ) as executor:
+            try:
+                return list(
+                    executor.map(
+                        lambda segment, copy_start: self._export_segment(
+                            segment,
+                            input_video_path,
+                            output_dir,
+                            tracking_data,
+                            copy_start,
+                        ),
+                        segments,
+                        copy_starts,
+                    )
+                )
+            except BaseException:
+                # Ctrl-C only reaches the main thread, and FFmpeg runs in its
+                # own session; stop the workers' FFmpegs and pending clips
+                self.cancel_event.set()
+                executor.shutdown(cancel_futures=True)
+                raise
+
+    def _get_worker_core_sets(self, workers: int) -> list[list[int]]:
+        """
+        Split the usable CPU cores into one contiguous set per export worker.
+
+        Args:
+            workers: Number of parallel export workers
+
+        Returns:
+            Core sets, or an empty list if pinning is disabled or unsupported
+        """
+        if not self.config.pin_export_workers or workers < 2:
+            return []
+        if not hasattr(os, "sched_getaffinity"):
+            logger.debug("CPU pinning is not supported on this platform")
+            return []
+
+        cores = sorted(os.sched_getaffinity(0))[: self._get_cpu_budget()]
+        if len(cores) < workers:
+            return []
+        return [
+            cores[len(cores) * i // workers : len(cores) * (i + 1) // workers]
+            for i in range(workers)
+        ]
+
+    def _stream_copy_segments_batch(
+        self,
+        segments: list[dict[str, Any]],
+        input_video_path: Path,
+        output_dir: Path,
+        copy_starts: list[float],
+    ) -> list[tuple[dict[str, Any] | None, dict[str, Any] | None]] | None:
+        """
+        Stream copy all segments with a single FFmpeg invocation.
+
+        Args:
+            segments: Segments with clip_id, start and end times
+            input_video_path: Path to input video file
+            output_dir: Directory to save exported clips
+            copy_starts: Keyframe-snapped start time per segment
+
+        Returns:
+            List of (exported clip entry, None) in segment order, or None if
+            the batch failed and clips should be exported one by one
+        """
+        return self._export_segments_batch(
+            segments,
+            input_video_path,
+            output_dir,
+            copy_starts,
+            input_params=[],
+            output_params=["-c", "copy"],
+            method="stream_copy_batch",
+            timeout_per_clip=300,  # 5 minutes per clip
+        )
+
+    def _transcode_segments_batch(
+        self,
+        segments: list[dict[str, Any]],
+        input_video_path: Path,
+        output_dir: Path,
+    ) -> list[tuple[dict[str, Any] | None, dict[str, Any] | None]] | None:
+        """
+        Transcode all segments with a single FFmpeg invocation.
+
+        Only valid for exports whose video filter is the same for every clip
+        (original format or center crop).
+
+        Args:
+            segments: Segments with clip_id, start and end times
+            input_video_path: Path to input video file
+            output_dir: Directory to save exported clips
+
+        Returns:
+            List of (exported clip entry, None) in segment order, or None if
+            the batch failed and clips should be exported one by one
+        """
+        threads = str(self._ffmpeg_threads)
+        format_config = self.formats[self.config.export_format]
+
+        if format_config["crop"]:
+            input_params = self.hwdecode_params
+            video_params = [
+                "-vf",
+                self._build_crop_scale_filter(format_config),
+                "-filter_threads",
+                threads,
+            ]
+            method = f"format_conversion_{self.config.export_format}_batch"
+        else:
+            input_params = self.hwaccel_params
+            video_params = []
+            method = "h264_transcode_batch"
+
+        return self._export_segments_batch(
+            segments,
+            input_video_path,
+            output_dir,
+            [segment["start"] for segment in segments],
+            input_params=input_params,
+            output_params=[
+                *video_params,
+                *self.h264_params,
+                "-threads",
+                threads,
+                *self._get_audio_params(input_video_path),
+            ],
+            method=method,
+            timeout_per_clip=600,  # 10 minutes per clip
+        )
+
+    def _export_segments_batch(
+        self,
+        segments: list[dict[str, Any]],
+        input_video_path: Path,
+        output_dir: Path,
+        start_times: list[float],
+        input_params: list[str],
+        output_params: list[str],
+        method: str,
+        timeout_per_clip: float,
+    ) -> list[tuple[dict[str, Any] | None, dict[str, Any] | None]] | None:
+        """
+        Export several segments with a single multi-output FFmpeg invocation.
+
+        Each clip gets its own input-seeked copy of the source, so FFmpeg only
+        reads the bytes of each clip instead of scanning the whole file, and
+        process startup and input probing are paid once per batch.
+
+        Args:
+            segments: Segments with clip_id, start and end times
+            input_video_path: Path to input video file
+            output_dir: Directory to save exported clips
+            start_times: Time to seek each input to
+            input_params: Extra FFmpeg options for every input
+            output_params: Codec (and filter) options for every output
+            method: Export method reported for the clips
+            timeout_per_clip: Timeout budget per clip in seconds
+
+        Returns:
+            List of (exported clip entry, None) in segment order, or None if
+            the batch failed and clips should be exported one by one
+        """
+        output_paths = [
+            self._get_output_path(output_dir, segment) for segment in segments
+        ]
+        staging_paths = [self._get_staging_path(path) for path in output_paths]
+
+        input_arg = str(input_video_path)
+        cmd = ["ffmpeg", *self.ffmpeg_global_params, "-y"]
+        for segment, start_time in zip(segments, start_times, strict=True):
+            cmd.extend(
+                [
+                    "-ss",
+                    str(start_time),
+                    "-to",
+                    str(segment["end"]),
+                    "-fflags",
+                    "+genpts",
+                    *input_params,
+                    "-i",
+                    input_arg,
+                ]
+            )
+        for index, staging_path in enumerate(staging_paths):
+            cmd.extend(
+                [
+                    "-map",
+                    f"{index}:v:0",
+                    "-map",
+                    f"{index}:a:0?",
+                    *output_params,
+                    *self.mp4_params,
+                    "-avoid_negative_ts",
+                    "make_zero",
+                    str(staging_path),
+                ]
+            )
+
+        logger.info(
+            f"Exporting {len(segments)} clips using {method} in a single FFmpeg pass"
+        )
+
+        try:
+            result = _run_ffmpeg(
+                cmd,
+                timeout=timeout_per_clip * len(segments),
+                cancel_event=self.cancel_event,
+            )
+
+            file_sizes = [_output_size(p) for p in staging_paths]
+            if result.returncode != 0 or None in file_sizes:
+                logger.warning(
+                    f"Batch {method} failed: {result.stderr}, "
+                    "exporting clips one by one"
+                )
+                return None
+
+            for staging_path, output_path in zip(
+                staging_paths, output_paths, strict=True
+            ):
+                self._commit_output(staging_path, output_path)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"Batch {method} timed out, exporting clips one by one")
+            return None
+        except Exception as e:
+            logger.warning(f"Batch {method} failed: {e}, exporting clips one by one")
+            return None
+        finally:
+            for staging_path in staging_paths:
+                staging_path.unlink(missing_ok=True)
+
+        results = []
+        for segment, start_time, output_path, file_size in zip(
+            segments, start_times, output_paths, file_sizes, strict=True
+        ):
+            logger.info(
+                f"✅ Successfully exported clip {segment['clip_id']} using {method}"
+            )
+            results.append(
+                (
+                    {
+                        "clip_id": segment["clip_id"],
+                        "output_path": str(output_path),
+                        "start_time": segment["start"],
+                        "end_time": segment["end"],
+                        "duration": segment["end"] - segment["start"],
+                        "export_method": method,
+                        "keyframe_snap": segment["start"] - start_time,
+                        "file_size": file_size,
+                    },
+                    None,
+                )
+            )
+        return results
+
+    def _get_output_path(self, output_dir: Path, segment: dict[str, Any]) -> Path:
+        """
+        Get the output clip path for a segment.
+
+        Args:
+            output_dir: Directory to save exported clips
+            segment: Segment with clip_id, start and end times
+
+        Returns:
+            Path for the exported clip
+        """
+        # Generate output filename with format suffix
+        output_filename = (
+            f"clip_{segment['clip_id']:03d}_{segment['start']:.1f}s-"
+            f"{segment['end']:.1f}s{self._clip_suffix}"
+        )
+        return output_dir / output_filename
+
+    def _export_segment(
+        self,
+        segment: dict[str, Any],
+        input_video_path: Path,
+        output_dir: Path,
+        tracking_data: dict[str, Any] | None,
+        copy_start: float | None,
+    ) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
+        """
+        Export the clip for one segment.
+
+        Args:
+            segment: Segment with clip_id, start and end times
+            input_video_path: Path to input video file
+            output_dir: Directory to save exported clips
+            tracking_data: Object tracking analysis results
+            copy_start: Keyframe-snapped stream copy start, None to transcode
+
+        Returns:
+            Tuple of (exported clip entry, export error entry); one is None
+        """
+        clip_id = segment["clip_id"]
+        start_time = segment["start"]
+        end_time = segment["end"]
+
+        logger.info(f"Exporting clip {clip_id}: {start_time:.2f}s - {end_time:.2f}s")
+
+        output_path = self._get_output_path(output_dir, segment)
+
+        try:
+            # Export single clip
+            export_result = self._export_single_clip(
+                input_video_path,
+                output_path,
+                start_time,
+                end_time,
+                tracking_data,
+                stream_copy_compatible=copy_start is not None,
+                copy_start=copy_start,
+            )
+        except Exception as e:
+            error_msg = f"Unexpected error exporting clip {clip_id}: {str(e)}"
+            logger.error(f"❌ {error_msg}")
+            return None, {"clip_id": clip_id, "error": error_msg}
+
+        if not export_result["success"]:
+            logger.error(
+                f"❌ Failed to export clip {clip_id}: {export_result['error']}"
+            )
+            return None, {"clip_id": clip_id, "error": export_result["error"]}
+
+        logger.info(
+            f"✅ Successfully exported clip {clip_id} using {export_result['method']}"
+        )
+        return {
+            "clip_id": clip_id,
+            "output_path": str(output_path),
+            "start_time": start_time,
+            "end_time": end_time,
+            "duration": end_time - start_time,
+            "export_method": export_result["method"],
+            "keyframe_snap": export_result.get("keyframe_snap", 0.0),
+            "file_size": export_result.get("file_size", 0),
+        }, None
+
     def _export_single_clip(
         self,
         input_path: Path,
@@ -180,35 +1189,146 @@ class VideoExporter:
         start_time: float,
         end_time: float,
         tracking_data: dict[str, Any] | None = None,
+        stream_copy_compatible: bool = True,
+        copy_start: float | None = None,
     ) -> dict[str, Any]:
         """
         Export a single video clip.
 
+        The clip is written to a staging path and moved into place only once
+        it is complete, so a failed or interrupted export never leaves a
+        partial clip at the output path.
+
+        Args:
+            input_path: Path to input video file
+            output_path: Path for output clip
+            start_time: Start time in seconds
+            end_time: End time in seconds
+            tracking_data: Object tracking analysis results
+            stream_copy_compatible: Whether input codecs allow stream copy
+            copy_start: Keyframe to start a stream copy at (default: start_time)
+
+        Returns:
+            Dict containing export result and metadata
+        """
+        staging_path = self._get_staging_path(output_path)
+        try:
+            result = self._export_clip_file(
+                input_path,
+                staging_path,
+                start_time,
+                end_time,
+                tracking_data,
+                stream_copy_compatible,
+                copy_start,
+            )
+            if result["success"]:
+                self._commit_output(staging_path, output_path)
+        finally:
+            staging_path.unlink(missing_ok=True)
+        return result
+
+    def _get_staging_path(self, output_path: Path) -> Path:
+        """
+        Get the path FFmpeg writes a clip to before it is moved into place.
+
+        Args:
+            output_path: Final path of the clip
+
+        Returns:
+            Hidden path in ``config.export_temp_dir`` or next to the clip
+        """
+        staging_dir = self.config.export_temp_dir or output_path.parent
+        return staging_dir / f"{self._staging_prefix}{output_path.name}"
+
+    def _get_clip_name(self, staging_path: Path) -> str:
+        """
+        Get the final clip file name for a staging path, for log messages.
+
+        Args:
+            staging_path: Path returned by _get_staging_path
+
+        Returns:
+            File name of the clip without the staging prefix
+        """
+        return staging_path.name.removeprefix(self._staging_prefix)
+
+    def _commit_output(self, staging_path: Path, output_path: Path) -> None:
+        """
+        Move a finished clip from its staging path to its output path.
+
+        This is a single rename when both are on the same filesystem and a
+        copy otherwise (e.g. from a local export_temp_dir to a network share).
+
+        Args:
+            staging_path: Path the clip was written to
+            output_path: Final path of the clip
+        """
+        shutil.move(staging_path, output_path)
+
+    def _export_clip_file(
+        self,
+        input_path: Path,
+        output_path: Path,
+        start_time: float,
+        end_time: float,
+        tracking_data: dict[str, Any] | None,
+        stream_copy_compatible: bool,
+        copy_start: float | None,
+    ) -> dict[str, Any]:
+        """
+        Write a single video clip with the best available export method.
+
         Args:
             input_path: Path to input video file
             output_path: Path for output clip
             start_time: Start time in seconds
             end_time: End time in seconds
+            tracking_data: Object tracking analysis results
+            stream_copy_compatible: Whether input codecs allow stream copy
+            copy_start: Keyframe to start a stream copy at (default: start_time)
 
         Returns:
             Dict containing export result and metadata
         """
-        # Check if format requires transcoding
-        if self.config.export_format == "original":
-            # For original format, try stream copy first
+        # Check if format requires transcoding; a planned copy start means the
+        # source already matches the export format
+        if self.config.export_format == "original" or copy_start is not None:
+            if not stream_copy_compatible:
+                return self._transcode_to_h264(
+                    input_path, output_path, start_time, end_time
+                )
+
+            # A clip spanning a whole faststart MP4 input with only the
+            # streams FFmpeg would map is the input itself
+            if (
+                self._covers_whole_input(input_path, start_time, end_time)
+                and self._has_single_av_streams(input_path)
+                and _is_faststart_mp4(input_path)
+            ):
+                file_copy_result = self._try_file_copy(input_path, output_path)
+                if file_copy_result["success"]:
+                    return file_copy_result
+
+            # For original format, try stream copy first, cut at the keyframe
+            # the seek lands on so the clip starts cleanly
+            if copy_start is None:
+                copy_start = start_time
             stream_copy_result = self._try_stream_copy(
-                input_path, output_path, start_time, end_time
+                input_path, output_path, copy_start, end_time
             )
 
             if stream_copy_result["success"]:
+                stream_copy_result["keyframe_snap"] = start_time - copy_start
                 return stream_copy_result
 
-            # If stream copy fails, fallback to h264 transcoding
+            # If stream copy fails, fallback to h264 transcoding; the audio
+            # may be what broke the copy, so it is re-encoded as well
             logger.info(
                 f"Stream copy failed, falling back to h264 transcoding for {output_path.name}"
             )
             return self._transcode_to_h264(
-                input_path, output_path, start_time, end_time
+                input_path, output_path, start_time, end_time, reencode_audio=True
             )
         else:
             # For non-original formats, use transcoding with format conversion
@@ -216,6 +1336,389 @@ class VideoExporter:
                 input_path, output_path, start_time, end_time, tracking_data
             )
 
+    def _matches_export_format(self, input_path: Path) -> bool:
+        """
+        Check whether the input already has the vertical/square output size.
+
+        Rotated or anamorphic inputs never match, since stream copying them
+        would keep a display geometry other than the target size.
+
+        Args:
+            input_path: Path to input video file
+
+        Returns:
+            True if the export format crops and the input is displayed at
+            exactly its size
+        """
+        format_config = self.formats[self.config.export_format]
+        if not format_config["crop"]:
+            return False
+
+        matches = self._get_video_dimensions(input_path) == (
+            format_config["width"],
+            format_config["height"],
+        ) and self._has_square_unrotated_pixels(input_path)
+        if matches:
+            logger.info(
+                f"Input is already {format_config['width']}x{format_config['height']}, "
+                f"exporting {self.config.export_format} clips without re-encoding"
+            )
+        return matches
+
+    def _has_square_unrotated_pixels(self, video_path: Path) -> bool:
+        """
+        Check whether the video is displayed at its coded size.
+
+        Args:
+            video_path: Path to video file
+
+        Returns:
+            True if the video stream has no rotation and a 1:1 (or unset)
+            sample aspect ratio
+        """
+        streams = self.get_video_info(video_path).get("streams", [])
+        stream = next((s for s in streams if s.get("codec_type") == "video"), None)
+        if stream is None:
+            return False
+
+        rotations = [stream.get("tags", {}).get("rotate", 0)]
+        rotations.extend(
+            side_data.get("rotation", 0)
+            for side_data in stream.get("side_data_list", [])
+        )
+        try:
+            if any(int(float(rotation)) % 360 for rotation in rotations):
+                return False
+        except (TypeError, ValueError):
+            return False
+
+        # ffprobe reports 0:1 or N/A when the container leaves SAR unset
+        sar = stream.get("sample_aspect_ratio", "1:1")
+        return sar in ("1:1", "0:1", "N/A")
+
+    def _covers_whole_input(
+        self, input_path: Path, start_time: float, end_time: float
+    ) -> bool:
+        """
+        Check whether a clip spans an entire MP4 input file.
+
+        Args:
+            input_path: Path to input video file
+            start_time: Start time in seconds
+            end_time: End time in seconds
+
+        Returns:
+            True if the clip starts at the beginning and ends at the end
+        """
+        if input_path.suffix.lower() != ".mp4" or start_time > 0.01:
+            return False
+
+        try:
+            duration = float(self.get_video_info(input_path)["format"]["duration"])
+        except (KeyError, TypeError, ValueError):
+            return False
+
+        return duration - end_time < 0.05
+
+    def _has_single_av_streams(self, video_path: Path) -> bool:
+        """
+        Check whether the input holds exactly the streams a clip keeps.
+
+        A copy of the whole file would also keep extra audio, subtitle and
+        data streams that FFmpeg's default mapping drops.
+
+        Args:
+            video_path: Path to video file
+
+        Returns:
+            True if the input has one video stream, at most one audio stream
+            and nothing else
+        """
+        stream_types = [
+            stream.get("codec_type")
+            for stream in self.get_video_info(video_path).get("streams", [])
+        ]
+        video_count = stream_types.count("video")
+        audio_count = stream_types.count("audio")
+        return (
+            video_count == 1
+            and audio_count <= 1
+            and len(stream_types) == video_count + audio_count
+        )
+
+    def _try_file_copy(self, input_path: Path, output_path: Path) -> dict[str, Any]:
+        """
+        Export a clip covering the whole input without running FFmpeg.
+
+        The input is copied rather than linked, so the clip stays independent
+        of the source file. shutil.copyfile uses kernel-side copies where the
+        platform supports them.
+
+        Args:
+            input_path: Path to input video file
+            output_path: Path for output clip
+
+        Returns:
+            Dict containing export result
+        """
+        try:
+            shutil.copyfile(input_path, output_path)
+        except OSError as e:
+            logger.warning(f"Failed to copy {input_path} to {output_path}: {e}")
+            return {"success": False, "error": f"File copy failed: {e}"}
+
+        return {
+            "success": True,
+            "method": "file_copy",
+            "file_size": output_path.stat().st_size,
+        }
+
+    def get_video_info(self, video_path: Path) -> dict[str, Any]:
+        """
+        Get container and stream information using ffprobe.
+
+        Results are cached per resolved path and modification time, so
+        repeated lookups for the same input do not spawn ffprobe again.
+
+        Args:
+            video_path: Path to video file
+
+        Returns:
+            Dict with ffprobe "format" and "streams" data limited to
+            ``PROBE_ENTRIES``, or empty dict on failure
+        """
+        try:
+            cache_key = (str(video_path.resolve()), video_path.stat().st_mtime_ns)
+        except OSError as e:
+            logger.warning(f"Failed to stat {video_path}: {e}")
+            return {}
+
+        if cache_key in self._probe_cache:
+            return self._probe_cache[cache_key]
+
+        # Only ask for the fields the exporter reads, not every stream and
+        # format tag, to keep ffprobe output and JSON parsing small
+        cmd = [
+            "ffprobe",
+            "-v",
+            "quiet",
+            "-print_format",
+            "json",
+            "-show_entries",
+            PROBE_ENTRIES,
+            str(video_path),
+        ]
+
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            info = json.loads(result.stdout)
+        except Exception as e:
+            logger.warning(f"Failed to probe {video_path}: {e}")
+            return {}
+
+        self._probe_cache[cache_key] = info
+        return info
+
+    def is_codec_compatible(self, video_path: Path) -> dict[str, Any]:
+        """
+        Check whether the input codecs can be stream copied into an MP4 clip.
+
+        Inputs that cannot be probed are reported as compatible so that
+        stream copy is still attempted.
+
+        Args:
+            video_path: Path to video file
+
+        Returns:
+            Dict with "compatible" flag and detected "video_codec"/"audio_codec"
+        """
+        info = self.get_video_info(video_path)
+        streams = info.get("streams", [])
+
+        video_codec = next(
+            (s.get("codec_name") for s in streams if s.get("codec_type") == "video"),
+            None,
+        )
+        audio_codec = next(
+            (s.get("codec_name") for s in streams if s.get("codec_type") == "audio"),
+            None,
+        )
+
+        if not info:
+            compatible = True
+        else:
+            compatible = video_codec in STREAM_COPY_VIDEO_CODECS and (
+                audio_codec is None or audio_codec in STREAM_COPY_AUDIO_CODECS
+            )
+
+        return {
+            "compatible": compatible,
+            "video_codec": video_codec,
+            "audio_codec": audio_codec,
+        }
+
+    def _get_audio_params(self, video_path: Path) -> list[str]:
+        """
+        Get audio codec parameters for transcoding a clip of the input.
+
+        AAC audio at a standard sample rate is copied as is, saving an audio
+        encode per clip; anything else is re-encoded with ``audio_params``.
+
+        Args:
+            video_path: Path to video file
+
+        Returns:
+            FFmpeg audio codec parameters
+        """
+        streams = self.get_video_info(video_path).get("streams", [])
+        audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+
+        if (
+            audio
+            and audio.get("codec_name") == "aac"
+            and str(audio.get("sample_rate")).isdigit()
+            and int(audio["sample_rate"]) in AUDIO_COPY_SAMPLE_RATES
+        ):
+            return ["-c:a", "copy"]
+        return self.audio_params
+
+    def _plan_stream_copy(
+        self, video_path: Path, segments: list[dict[str, Any]]
+    ) -> list[float | None]:
+        """
+        Snap segment starts to keyframes for stream copy.
+
+        Stream copy can only start a clip on a keyframe, so each clip is cut
+        from the keyframe preceding the requested start and keeps its end
+        time. Clips whose keyframe is further away than
+        ``config.keyframe_tolerance`` would start noticeably early, and clips
+        whose keyframe lies after the start would lose their first frames, so
+        both are transcoded instead.
+
+        Args:
+            video_path: Path to video file
+            segments: Segments with start and end times
+
+        Returns:
+            Per-segment stream copy start time, None where the segment
+            should be transcoded
+        """
+        keyframes = self._get_seek_keyframes(
+            video_path, [segment["start"] for segment in segments]
+        )
+
+        copy_starts: list[float | None] = []
+        for segment, keyframe in zip(segments, keyframes, strict=True):
+            if keyframe is None:
+                # Unknown keyframe position, let stream copy try unsnapped
+                copy_starts.append(segment["start"])
+                continue
+
+            drift = segment["start"] - keyframe
+            if drift < 0:
+                # The seek landed past the start (imprecise container
+                # seeking); a copy from there would drop the clip's start
+                logger.info(
+                    f"Clip {segment['clip_id']}: keyframe found {-drift:.2f}s "
+                    "after start, transcoding instead of stream copy"
+                )
+                copy_starts.append(None)
+            elif drift > self.config.keyframe_tolerance:
+                logger.info(
+                    f"Clip {segment['clip_id']}: nearest keyframe is {drift:.2f}s "
+                    "before start, transcoding instead of stream copy"
+                )
+                copy_starts.append(None)
+            else:
+                copy_starts.append(keyframe)
+
+        return copy_starts
+
+    def _get_seek_keyframes(
+        self, video_path: Path, start_times: list[float]
+    ) -> list[float | None]:
+        """
+        Find the keyframe an input seek lands on for each start time.
+
+        Uses a single ffprobe call that seeks to every start time and reads
+        only the first video packet there, without scanning the whole file.
+
+        ffprobe intervals and packet times are stream timestamps, while an
+        FFmpeg input ``-ss`` is relative to the container start time, so
+        times are shifted by that offset in both directions.
+
+        Args:
+            video_path: Path to video file
+            start_times: Clip start times in seconds, as passed to ``-ss``
+
+        Returns:
+            Keyframe time per start time on the ``-ss`` timeline, or None
+            where it could not be found
+        """
+        if not start_times:
+            return []
+
+        offset = self._get_start_time(video_path)
+
+        # ffprobe reads intervals in order, so query them sorted
+        order = sorted(range(len(start_times)), key=lambda i: start_times[i])
+        intervals = ",".join(f"{start_times[i] + offset}%+#1" for i in order)
+
+        cmd = [
+            "ffprobe",
+            "-v",
+            "error",
+            "-select_streams",
+            "v:0",
+            "-read_intervals",
+            intervals,
+            "-show_entries",
+            "packet=pts_time,flags",
+            "-of",
+            "csv=p=0",
+            str(video_path),
+        ]
+
+        try:
+            result = subprocess.run(
+                cmd, capture_output=True, text=True, check=True, timeout=60
+            )
+        except Exception as e:
+            logger.warning(f"Failed to probe keyframes of {video_path}: {e}")
+            return [None] * len(start_times)
+
+        packets = [line.split(",") for line in result.stdout.splitlines() if line]
+        if len(packets) != len(start_times):
+            logger.warning(
+                f"Expected {len(start_times)} keyframe packets, got {len(packets)}"
+            )
+            return [None] * len(start_times)
+
+        keyframes: list[float | None] = [None] * len(start_times)
+        for i, (pts_time, flags, *_) in zip(order, packets, strict=True):
+            if "K" in flags and pts_time != "N/A":
+                # ffprobe prints microsecond precision; rounding keeps the
+                # offset subtraction from producing float noise
+                keyframes[i] = max(0.0, round(float(pts_time) - offset, 6))
+
+        return keyframes
+
+    def _get_start_time(self, video_path: Path) -> float:
+        """
+        Get the container start time from the cached ffprobe results.
+
+        Args:
+            video_path: Path to video file
+
+        Returns:
+            Start time in seconds, 0.0 if it cannot be determined
+        """
+        start_time = self.get_video_info(video_path).get("format", {}).get("start_time")
+        try:
+            return float(start_time)
+        except (TypeError, ValueError):
+            return 0.0
+
     def _try_stream_copy(
         self, input_path: Path, output_path: Path, start_time: float, end_time: float
     ) -> dict[str, Any]:
@@ -231,38 +1734,40 @@ class VideoExporter:
         Returns:
             Dict containing export result
         """
-        duration = end_time - start_time
-
         # FFmpeg command for stream copy
         cmd = [
             "ffmpeg",
+            *self.ffmpeg_global_params,  # Quiet, non-interactive FFmpeg
+            *self.progress_params,  # Progress reports on stdout
             "-y",  # Overwrite output files
             "-ss",
-            str(start_time),  # Start time
-            "-t",
-            str(duration),  # Duration
+            str(start_time),  # Seek on input side to nearest keyframe
+            "-to",
+            str(end_time),  # Stop reading the input at the clip end
+            "-fflags",
+            "+genpts",  # Regenerate missing timestamps
             "-i",
             str(input_path),  # Input file
             "-c",
             "copy",  # Stream copy
+            *self.mp4_params,  # Container parameters
             "-avoid_negative_ts",
             "make_zero",  # Handle negative timestamps
             str(output_path),
         ]
 
         try:
-            logger.debug(f"Running stream copy command: {' '.join(cmd)}")
-
             # Run FFmpeg command
-            result = subprocess.run(
+            result = _run_ffmpeg(
                 cmd,
-                capture_output=True,
-                text=True,
                 timeout=300,  # 5 minute timeout
+                duration=end_time - start_time,
+                cancel_event=self.cancel_event,
+                label=self._get_clip_name(output_path),
             )
 
-            if result.returncode == 0 and output_path.exists():
-                file_size = output_path.stat().st_size
+            file_size = _output_size(output_path) if result.returncode == 0 else None
+            if file_size is not None:
                 return {
                     "success": True,
                     "method": "stream_copy",
@@ -283,7 +1788,12 @@ class VideoExporter:
             return {"success": False, "error": error_msg}
 
     def _transcode_to_h264(
-        self, input_path: Path, output_path: Path, start_time: float, end_time: float
+        self,
+        input_path: Path,
+        output_path: Path,
+        start_time: float,
+        end_time: float,
+        reencode_audio: bool = False,
     ) -> dict[str, Any]:
         """
         Transcode video to h264 with high quality settings.
@@ -293,42 +1803,53 @@ class VideoExporter:
             output_path: Path for output clip
             start_time: Start time in seconds
             end_time: End time in seconds
+            reencode_audio: Re-encode audio even if it could be copied, e.g.
+                after a stream copy of the clip failed
 
         Returns:
             Dict containing export result
         """
-        duration = end_time - start_time
+        audio_params = (
+            self.audio_params if reencode_audio else self._get_audio_params(input_path)
+        )
 
         # FFmpeg command for h264 transcoding
         cmd = [
             "ffmpeg",
+            *self.ffmpeg_global_params,  # Quiet, non-interactive FFmpeg
+            *self.progress_params,  # Progress reports on stdout
             "-y",  # Overwrite output files
             "-ss",
-            str(start_time),  # Start time
-            "-t",
-            str(duration),  # Duration
+            str(start_time),  # Seek on input side to nearest keyframe
+            "-to",
+            str(end_time),  # Stop reading the input at the clip end
+            "-fflags",
+            "+genpts",  # Regenerate missing timestamps
+            *self.hwaccel_params,  # Hardware decoding parameters
             "-i",
             str(input_path),  # Input file
             *self.h264_params,  # Video codec parameters
-            *self.audio_params,  # Audio codec parameters
+            "-threads",
+            str(self._ffmpeg_threads),  # Encoder threads per clip
+            *audio_params,  # Audio codec parameters
+            *self.mp4_params,  # Container parameters
             "-avoid_negative_ts",
             "make_zero",  # Handle negative timestamps
             str(output_path),
         ]
 
         try:
-            logger.debug(f"Running h264 transcoding command: {' '.join(cmd)}")
-
             # Run FFmpeg command
-            result = subprocess.run(
+            result = _run_ffmpeg(
                 cmd,
-                capture_output=True,
-                text=True,
                 timeout=600,  # 10 minute timeout for transcoding
+                duration=end_time - start_time,
+                cancel_event=self.cancel_event,
+                label=self._get_clip_name(output_path),
             )
 
-            if result.returncode == 0 and output_path.exists():
-                file_size = output_path.stat().st_size
+            file_size = _output_size(output_path) if result.returncode == 0 else None
+            if file_size is not None:
                 return {
                     "success": True,
                     "method": "h264_transcode",
@@ -374,11 +1895,16 @@ class VideoExporter:
         # Build FFmpeg command with format conversion
         cmd = [
             "ffmpeg",
+            *self.ffmpeg_global_params,  # Quiet, non-interactive FFmpeg
+            *self.progress_params,  # Progress reports on stdout
             "-y",  # Overwrite output files
             "-ss",
-            str(start_time),  # Start time
-            "-t",
-            str(duration),  # Duration
+            str(start_time),  # Seek on input side to nearest keyframe
+            "-to",
+            str(end_time),  # Stop reading the input at the clip end
+            "-fflags",
+            "+genpts",  # Regenerate missing timestamps
+            *self.hwdecode_params,  # Hardware decoding into system memory
             "-i",
             str(input_path),  # Input file
         ]
@@ -392,38 +1918,50 @@ class VideoExporter:
                 and self.dynamic_cropper
             ):
                 crop_scale_filter = self._build_dynamic_crop_filter(
-                    input_path, start_time, duration, format_config, tracking_data
+                    input_path,
+                    start_time,
+                    duration,
+                    format_config,
+                    tracking_data,
+                    self._get_video_dimensions(input_path),
                 )
             # Check if auto-reframe is enabled
             elif self.config.auto_reframe and self.people_detector:
                 crop_scale_filter = self._build_auto_reframe_filter(
-                    input_path, start_time, duration, format_config
+                    input_path,
+                    start_time,
+                    duration,
+                    format_config,
+                    self._get_video_dimensions(input_path),
                 )
             else:
                 crop_scale_filter = self._build_crop_scale_filter(format_config)
             cmd.extend(["-vf", crop_scale_filter])
 
-        # Always add H.264 parameters for all formats
+        # Always add H.264 parameters for all formats; the crop/scale graph
+        # gets the same thread budget as the encoder
         cmd.extend(self.h264_params)
+        cmd.extend(["-threads", str(self._ffmpeg_threads)])
+        cmd.extend(["-filter_threads", str(self._ffmpeg_threads)])
 
         # Add audio codec parameters
-        cmd.extend(self.audio_params)
+        cmd.extend(self._get_audio_params(input_path))
+        cmd.extend(self.mp4_params)
         cmd.extend(["-avoid_negative_ts", "make_zero"])
         cmd.append(str(output_path))
 
         try:
-            logger.debug(f"Running format conversion command: {' '.join(cmd)}")
-
             # Run FFmpeg command
-            result = subprocess.run(
+            result = _run_ffmpeg(
                 cmd,
-                capture_output=True,
-                text=True,
                 timeout=600,  # 10 minute timeout for transcoding
+                duration=duration,
+                cancel_event=self.cancel_event,
+                label=self._get_clip_name(output_path),
             )
 
-            if result.returncode == 0 and output_path.exists():
-                file_size = output_path.stat().st_size
+            file_size = _output_size(output_path) if result.returncode == 0 else None
+            if file_size is not None:
                 return {
                     "success": True,
                     "method": f"format_conversion_{self.config.export_format}",
@@ -471,13 +2009,33 @@ class VideoExporter:
             filter_parts.append("crop=ih:ih")
 
         # Scale to target dimensions
-        filter_parts.append(f"scale={width}:{height}")
+        filter_parts.append(self._build_scale_filter(width, height))
 
         # Join filters
         filter_string = ",".join(filter_parts)
 
         return filter_string
 
+    def _build_scale_filter(self, width: int, height: int) -> str:
+        """
+        Build the FFmpeg filter scaling cropped frames to the output size.
+
+        With NVENC the cropped frames are uploaded to the GPU and scaled
+        there, so the encoder reads them from GPU memory instead of copying
+        full-size frames over PCIe. Cropping stays on the CPU since FFmpeg
+        has no CUDA crop filter for time-varying crop expressions.
+
+        Args:
+            width: Output width in pixels
+            height: Output height in pixels
+
+        Returns:
+            FFmpeg filter string
+        """
+        if self.use_nvenc:
+            return f"hwupload_cuda,scale_cuda={width}:{height}"
+        return f"scale={width}:{height}"
+
     def _build_dynamic_crop_filter(
         self,
         input_path: Path,
@@ -485,6 +2043,7 @@ class VideoExporter:
         duration: float,
         format_config: dict[str, Any],
         tracking_data: dict[str, Any],
+        input_dimensions: tuple[int, int],
     ) -> str:
         """
         Build FFmpeg filter with dynamic cropping using object tracking.
@@ -495,6 +2054,7 @@ class VideoExporter:
             duration: Duration in seconds
             format_config: Format configuration dictionary
             tracking_data: Object tracking analysis results
+            input_dimensions: Probed (width, height) of the input video
 
         Returns:
             FFmpeg filter string with dynamic cropping
@@ -507,9 +2067,9 @@ class VideoExporter:
                 )
                 return self._build_crop_scale_filter(format_config)
 
-            # Get video dimensions from tracking data
-            video_width, video_height = tracking_data.get(
-                "video_dimensions", (1920, 1080)
+            # Get video dimensions from tracking data, else from the probe
+            video_width, video_height = (
+                tracking_data.get("video_dimensions") or input_dimensions
             )
 
             # Calculate crop dimensions for target format
@@ -517,12 +2077,10 @@ class VideoExporter:
                 video_width, video_height, self.config.export_format
             )
 
-            # Generate timeline for this clip
-            import numpy as np
-
-            clip_times = np.linspace(
-                start_time, start_time + duration, num=10
-            )  # 10 points for smooth interpolation
+            # Generate timeline for this clip, evenly spaced from start to end
+            points = self.config.crop_interp_points
+            step = duration / (points - 1)
+            clip_times = [start_time + i * step for i in range(points)]
 
             # Interpolate tracking positions for this clip timeline
             tracking_positions = self.object_tracker.interpolate_to_export_timeline(
@@ -546,7 +2104,9 @@ class VideoExporter:
             )
 
             # Add scale filter
-            scale_filter = f"scale={format_config['width']}:{format_config['height']}"
+            scale_filter = self._build_scale_filter(
+                format_config["width"], format_config["height"]
+            )
 
             # Combine filters
             combined_filter = f"{crop_filter},{scale_filter}"
@@ -567,6 +2127,7 @@ class VideoExporter:
         start_time: float,
         duration: float,
         format_config: dict[str, Any],
+        input_dimensions: tuple[int, int],
     ) -> str:
         """
         Build FFmpeg filter with auto-reframe using people detection.
@@ -576,6 +2137,7 @@ class VideoExporter:
             start_time: Start time in seconds
             duration: Duration in seconds
             format_config: Format configuration dictionary
+            input_dimensions: Probed (width, height) of the input video
 
         Returns:
             FFmpeg filter string with auto-reframe
@@ -591,8 +2153,7 @@ class VideoExporter:
                 center_x = detection_result["center_x"]
                 logger.info(f"Auto-reframe: Using people detection center X={center_x}")
 
-                # Get actual input video dimensions
-                input_width, input_height = self._get_video_dimensions(input_path)
+                input_width, input_height = input_dimensions
 
                 # Calculate crop window around detected people
                 (
@@ -611,7 +2172,9 @@ class VideoExporter:
                 # Build filter with auto-reframe crop
                 filter_parts = [
                     f"crop={crop_width}:{crop_height}:{crop_x}:{crop_y}",
-                    f"scale={format_config['width']}:{format_config['height']}",
+                    self._build_scale_filter(
+                        format_config["width"], format_config["height"]
+                    ),
                 ]
 
                 return ",".join(filter_parts)
@@ -628,48 +2191,27 @@ class VideoExporter:
 
     def _get_video_dimensions(self, video_path: Path) -> tuple[int, int]:
         """
-        Get video dimensions using ffprobe.
+        Get video dimensions from the cached ffprobe results.
 
         Args:
             video_path: Path to video file
 
         Returns:
-            Tuple of (width, height)
+            Tuple of (width, height), 1920x1080 if they cannot be determined
         """
-        try:
-            import json
-            import subprocess
-
-            # Use ffprobe to get video dimensions
-            cmd = [
-                "ffprobe",
-                "-v",
-                "quiet",
-                "-print_format",
-                "json",
-                "-show_streams",
-                str(video_path),
-            ]
-
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            data = json.loads(result.stdout)
-
-            # Find video stream
-            for stream in data.get("streams", []):
-                if stream.get("codec_type") == "video":
-                    width = int(stream.get("width", 1920))
-                    height = int(stream.get("height", 1080))
-                    logger.debug(f"Video dimensions: {width}x{height}")
-                    return width, height
-
-            # Fallback to default dimensions
-            logger.warning(
-                "Could not determine video dimensions, using default 1920x1080"
-            )
-            return 1920, 1080
-
-        except Exception as e:
-            logger.warning(
-                f"Failed to get video dimensions: {e}, using default 1920x1080"
-            )
-            return 1920, 1080
+        streams = self.get_video_info(video_path).get("streams", [])
+
+        # Find video stream
+        for stream in streams:
+            if stream.get("codec_type") == "video":
+                try:
+                    width = int(stream["width"])
+                    height = int(stream["height"])
+                except (KeyError, TypeError, ValueError):
+                    break
+                logger.debug(f"Video dimensions: {width}x{height}")
+                return width, height
+
+        # Fallback to default dimensions
+        logger.warning("Could not determine video dimensions, using default 1920x1080")
+        return 1920, 1080
@@ -2,14 +2,25 @@
 Pytest configuration for the analyzer test suite.
 """
 
+from pathlib import Path
+
 import pytest
 
+# Custom pytest markers and their descriptions
+MARKERS = (
+    "unit: Unit test",
+    "integration: Integration test",
+    "performance: Performance test",
+    "regression: Regression test",
+    "slow: Slow test (> 5s)",
+    "requires_ffmpeg: Requires ffmpeg",
+    "requires_video: Requires video file",
+)
+
 
 @pytest.fixture(scope="session")
 def test_data_dir():
     """Provide path to test data directory."""
-    from pathlib import Path
-
     return Path(__file__).parent.parent / "data"
 
 
@@ -31,13 +42,7 @@ def test_audio_file(test_data_dir):
     return audio_file
 
 
-# Custom pytest markers
 def pytest_configure(config):
     """Register custom markers."""
-    config.addinivalue_line("markers", "unit: Unit test")
-    config.addinivalue_line("markers", "integration: Integration test")
-    config.addinivalue_line("markers", "performance: Performance test")
-    config.addinivalue_line("markers", "regression: Regression test")
-    config.addinivalue_line("markers", "slow: Slow test (> 5s)")
-    config.addinivalue_line("markers", "requires_ffmpeg: Requires ffmpeg")
-    config.addinivalue_line("markers", "requires_video: Requires video file")
+    for marker in MARKERS:
+        config.addinivalue_line("markers", marker)
@@ -364,9 +364,10 @@ class TestIntegrationEpicE3:
             # Setup signal handlers
             cm.setup_signal_handlers()
 
-            # Simulate signal handler call
+            # Simulate signal handler call; it interrupts the work in progress
             signal_handler = mock_signal.call_args_list[0][0][1]
-            signal_handler(signal.SIGTERM, None)
+            with pytest.raises(KeyboardInterrupt):
+                signal_handler(signal.SIGTERM, None)
 
             # Verify cancellation was requested
             assert cm.is_cancelled() is True
@@ -406,3 +407,99 @@ class TestIntegrationEpicE3:
 
         # Verify processes were cleaned up
         assert len(rm.child_processes) == 0
+
+    def test_signal_stops_video_export(self, tmp_path):
+        """Test a termination signal interrupts a running video export."""
+        from analyzer.config import Config
+        from analyzer.core import Analyzer
+
+        rm = ResourceManager()
+        cm = CancellationManager(rm)
+        rm.set_cancellation_manager(cm)
+        analyzer = Analyzer(Config(input_path=Path("test.mp4"), export_video=True), cm)
+        exporter = analyzer.video_exporter
+        video = tmp_path / "input.mp4"
+        video.write_bytes(b"\0")
+        segments = {
+            "segments": [{"clip_id": 0, "start": 0.0, "end": 10.0, "length": 10.0}]
+        }
+
+        with patch("signal.signal") as mock_signal:
+            cm.setup_signal_handlers()
+        signal_handler = mock_signal.call_args_list[0][0][1]
+
+        def run_ffmpeg(cmd, **kwargs):
+            # SIGTERM arrives while FFmpeg is encoding
+            signal_handler(signal.SIGTERM, None)
+            return subprocess.CompletedProcess(cmd, 0, stderr="")
+
+        with (
+            patch.object(exporter, "get_video_info", return_value={}),
+            patch("analyzer.video._run_ffmpeg", side_effect=run_ffmpeg),
+            pytest.raises(KeyboardInterrupt),
+        ):
+            exporter.export_clips(segments, video, tmp_path / "clips")
+
+        assert cm.is_cancelled() is True
+
+    def test_signal_handler_does_not_take_cancel_lock(self):
+        """Test a signal landing while the lock is held cannot deadlock."""
+        rm = ResourceManager()
+        cm = CancellationManager(rm)
+        rm.cleanup_processes = Mock(return_value=True)
+
+        with patch("signal.signal") as mock_signal:
+            cm.setup_signal_handlers()
+        signal_handler = mock_signal.call_args_list[0][0][1]
+
+        with cm._lock, pytest.raises(KeyboardInterrupt):
+            signal_handler(signal.SIGTERM, None)
+
+        assert cm.cancelled is True
+        rm.cleanup_processes.assert_not_called()
+
+    def test_cancel_stops_video_export(self, tmp_path):
+        """Test CancellationManager.cancel() stops the analyzer's video export."""
+        from analyzer.config import Config
+        from analyzer.core import Analyzer
+
+        rm = ResourceManager()
+        cm = CancellationManager(rm)
+        analyzer = Analyzer(Config(input_path=Path("test.mp4"), export_video=True), cm)
+        exporter = analyzer.video_exporter
+        video = tmp_path / "input.mp4"
+        video.write_bytes(b"\0")
+        segments = {
+            "segments": [{"clip_id": 0, "start": 0.0, "end": 10.0, "length": 10.0}]
+        }
+
+        def run_ffmpeg(cmd, **kwargs):
+            # Cancelled from another thread while FFmpeg is encoding
+            canceller = threading.Thread(target=cm.cancel)
+            canceller.start()
+            canceller.join()
+            if kwargs["cancel_event"].is_set():
+                raise KeyboardInterrupt("Operation cancelled")
+            return subprocess.CompletedProcess(cmd, 0, stderr="")
+
+        with (
+            patch.object(exporter, "get_video_info", return_value={}),
+            patch("analyzer.video._run_ffmpeg", side_effect=run_ffmpeg),
+            pytest.raises(KeyboardInterrupt),
+        ):
+            exporter.export_clips(segments, video, tmp_path / "clips")
+
+        assert exporter.cancel_event.is_set()
+
+    def test_sigint_handler_raises_keyboard_interrupt(self):
+        """Test Ctrl-C still interrupts the work in progress."""
+        rm = ResourceManager()
+        cm = CancellationManager(rm)
+
+        with patch("signal.signal") as mock_signal:
+            cm.setup_signal_handlers()
+        signal_handler = mock_signal.call_args_list[1][0][1]
+
+        with pytest.raises(KeyboardInterrupt):
+            signal_handler(signal.SIGINT, None)
+        assert cm.is_cancelled() is True
@@ -0,0 +1,1203 @@
+"""
+Tests for video clip export.
+
+Tests FFmpeg command construction for the export paths:
+- Stream copy for original format
+- H.264 transcoding fallback
+- Format conversion (vertical/square)
+"""
+
+import json
+import logging
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from analyzer.config import Config
+from analyzer.video import (
+    NVENC_MAX_WORKERS,
+    STDERR_TAIL_LINES,
+    STREAM_COPY_BATCH_SIZE,
+    VideoExporter,
+    _detect_nvenc,
+    _run_ffmpeg,
+)
+
+
+def _completed(cmd, returncode=0, stderr=""):
+    """Build a CompletedProcess and create the output file on success."""
+    if returncode == 0:
+        for index, arg in enumerate(cmd):
+            if arg.endswith(".mp4") and cmd[index - 1] != "-i":
+                Path(arg).write_bytes(b"\0" * 16)
+    return subprocess.CompletedProcess(cmd, returncode, stdout="", stderr=stderr)
+
+
+def _mp4_boxes(*box_types):
+    """Build MP4 bytes made of empty top-level boxes of the given types."""
+    return b"".join((8).to_bytes(4, "big") + box_type for box_type in box_types)
+
+
+def _probe_output(
+    video_codec="h264",
+    audio_codec="aac",
+    width=1280,
+    height=720,
+    sample_rate=48000,
+    start_time=0.0,
+    **video_fields,
+):
+    """Build a CompletedProcess carrying ffprobe JSON output."""
+    streams = [
+        {
+            "codec_type": "video",
+            "codec_name": video_codec,
+            "width": width,
+            "height": height,
+            **video_fields,
+        }
+    ]
+    if audio_codec:
+        streams.append(
+            {
+                "codec_type": "audio",
+                "codec_name": audio_codec,
+                "sample_rate": str(sample_rate),
+            }
+        )
+    payload = json.dumps(
+        {
+            "format": {"duration": "60.0", "start_time": f"{start_time:.6f}"},
+            "streams": streams,
+        }
+    )
+    return subprocess.CompletedProcess([], 0, stdout=payload, stderr="")
+
+
+def _keyframe_output(cmd, drift=1.0):
+    """Build ffprobe packet CSV with a keyframe drift seconds before each seek."""
+    intervals = cmd[cmd.index("-read_intervals") + 1].split(",")
+    starts = [float(interval.split("%")[0]) for interval in intervals]
+    lines = [f"{max(0.0, start - drift):.6f},K_" for start in starts]
+    return subprocess.CompletedProcess(cmd, 0, stdout="\n".join(lines), stderr="")
+
+
+def _fake_run(cmd, **kwargs):
+    """Fake subprocess.run answering both ffprobe and ffmpeg calls."""
+    if cmd[0] == "ffprobe":
+        if "-read_intervals" in cmd:
+            return _keyframe_output(cmd)
+        return _probe_output()
+    return _completed(cmd)
+
+
+def _segments(count):
+    """Build segments_data with count non-overlapping clips."""
+    return {
+        "segments": [
+            {"clip_id": i, "start": i * 60.0, "end": i * 60.0 + 20.0}
+            for i in range(count)
+        ]
+    }
+
+
+@pytest.fixture
+def exporter():
+    """Provide a VideoExporter with original export format."""
+    return VideoExporter(Config(input_path=Path("test.mp4")))
+
+
+class TestVideoExporterCommands:
+    """Test FFmpeg command construction in VideoExporter."""
+
+    def test_transcode_to_h264_writes_faststart_mp4(self, exporter, tmp_path):
+        """Test h264 transcoding emits faststart and genpts flags."""
+        output_path = tmp_path / "clip.mp4"
+
+        with patch(
+            "analyzer.video._run_ffmpeg",
+            side_effect=lambda cmd, **kw: _completed(cmd),
+        ) as mock_run:
+            result = exporter._transcode_to_h264(
+                Path("input.mp4"), output_path, 10.0, 25.0
+            )
+
+        cmd = mock_run.call_args[0][0]
+        assert result["success"] is True
+        assert result["method"] == "h264_transcode"
+        assert cmd[cmd.index("-movflags") + 1] == "+faststart"
+        assert cmd.index("-fflags") < cmd.index("-i")
+        assert cmd.index("-to") < cmd.index("-i")
+
+    def test_transcode_with_format_writes_faststart_mp4(self, tmp_path):
+        """Test format conversion emits faststart and crop/scale filter."""
+        exporter = VideoExporter(
+            Config(input_path=Path("test.mp4"), export_format="vertical")
+        )
+        output_path = tmp_path / "clip_vertical.mp4"
+
+        with patch(
+            "analyzer.video._run_ffmpeg",
+            side_effect=lambda cmd, **kw: _completed(cmd),
+        ) as mock_run:
+            result = exporter._transcode_with_format(
+                Path("input.mp4"), output_path, 10.0, 25.0
+            )
+
+        cmd = mock_run.call_args[0][0]
+        assert result["success"] is True
+        assert result["method"] == "format_conversion_vertical"
+        assert cmd[cmd.index("-vf") + 1] == "crop=ih*9/16:ih,scale=1080:1920"
+        assert cmd[cmd.index("-movflags") + 1] == "+faststart"
+        assert cmd.index("-ss") < cmd.index("-to") < cmd.index("-i")
+        assert "-t" not in cmd
+        assert cmd[cmd.index("-filter_threads") + 1] == cmd[cmd.index("-threads") + 1]
+
+    def test_missing_output_is_reported_as_failure(self, exporter, tmp_path):
+        """Test a zero exit status without an output file is not a success."""
+        with patch(
+            "analyzer.video._run_ffmpeg",
+            return_value=subprocess.CompletedProcess([], 0, stdout="", stderr=""),
+        ):
+            result = exporter._transcode_to_h264(
+                Path("input.mp4"), tmp_path / "clip.mp4", 10.0, 25.0
+            )
+
+        assert result["success"] is False
+
+    def test_stream_copy_failure_falls_back_to_h264(self, exporter, tmp_path):
+        """Test original format falls back to transcoding when copy fails."""
+        output_path = tmp_path / "clip.mp4"
+        results = iter([1, 0])
+
+        with patch(
+            "analyzer.video._run_ffmpeg",
+            side_effect=lambda cmd, **kw: _completed(cmd, next(results), "boom"),
+        ) as mock_run:
+            result = exporter._export_single_clip(
+                Path("input.mp4"), output_path, 10.0, 25.0
+            )
+
+        assert mock_run.call_count == 2
+        assert result["method"] == "h264_transcode"
+
+    def test_stream_copy_fallback_reencodes_copyable_audio(self, exporter, tmp_path):
+        """Test the transcode after a failed copy never copies the audio."""
+        video = tmp_path / "input.mp4"
+        video.write_bytes(b"\0")
+        results = iter([1, 0])
+
+        with (
+            patch("analyzer.video.subprocess.run", return_value=_probe_output()),
+            patch(
+                "analyzer.video._run_ffmpeg",
+                side_effect=lambda cmd, **kw: _completed(cmd, next(results), "boom"),
+            ) as mock_run,
+        ):
+            result = exporter._export_single_clip(
+                video, tmp_path / "clip.mp4", 10.0, 25.0
+            )
+
+        cmd = mock_run.call_args[0][0]
+        assert result["method"] == "h264_transcode"
+        assert cmd[cmd.index("-c:a") + 1] == "aac"
+
+    def test_whole_input_clip_skips_ffmpeg(self, exporter, tmp_path):
+        """Test a clip spanning a whole faststart input is copied, not re-muxed."""
+        video = tmp_path / "input.mp4"
+        video.write_bytes(_mp4_boxes(b"ftyp", b"moov", b"mdat"))
+        output_path = tmp_path / "clip.mp4"
+
+        with (
+            patch("analyzer.video.subprocess.run", return_value=_probe_output()),
+            patch("analyzer.video._run_ffmpeg") as mock_ffmpeg,
+        ):
+            result = exporter._export_single_clip(video, output_path, 0.0, 60.0)
+
+        assert mock_ffmpeg.call_count == 0
+        assert result["method"] == "file_copy"
+        assert result["file_size"] == video.stat().st_size
+        assert output_path.read_bytes() == video.read_bytes()
+        assert not output_path.samefile(video)
+
+    def test_whole_input_clip_with_extra_streams_is_remuxed(self, exporter, tmp_path):
+        """Test a whole-input clip with extra tracks keeps FFmpeg's mapping."""
+        video = tmp_path / "input.mp4"
+        video.write_bytes(_mp4_boxes(b"ftyp", b"moov", b"mdat"))
+        output_path = tmp_path / "clip.mp4"
+        probe = _probe_output()
+        info = json.loads(probe.stdout)
+        info["streams"].append({"codec_type": "subtitle", "codec_name": "mov_text"})
+        probe.stdout = json.dumps(info)
+
+        with (
+            patch("analyzer.video.subprocess.run", return_value=probe),
+            patch(
+                "analyzer.video._run_ffmpeg",
+                side_effect=lambda cmd, **kw: _completed(cmd),
+            ) as mock_ffmpeg,
+        ):
+            result = exporter._export_single_clip(video, output_path, 0.0, 60.0)
+
+        assert mock_ffmpeg.call_count == 1
+        assert result["method"] == "stream_copy"
+
+    def test_whole_input_clip_without_faststart_is_remuxed(self, exporter, tmp_path):
+        """Test a whole-input clip of a non-faststart MP4 goes through FFmpeg."""
+        video = tmp_path / "input.mp4"
+        video.write_bytes(_mp4_boxes(b"ftyp", b"mdat", b"moov"))
+        output_path = tmp_path / "clip.mp4"
+
+        with (
+            patch("analyzer.video.subprocess.run", return_value=_probe_output()),
+            patch(
+                "analyzer.video._run_ffmpeg",
+                side_effect=lambda cmd, **kw: _completed(cmd),
+            ) as mock_ffmpeg,
+        ):
+            result = exporter._export_single_clip(video, output_path, 0.0, 60.0)
+
+        assert mock_ffmpeg.call_count == 1
+        assert "+faststart" in mock_ffmpeg.call_args[0][0]
+        assert result["method"] == "stream_copy"
+
+    def test_clip_is_staged_then_moved_into_place(self, tmp_path):
+        """Test FFmpeg writes to export_temp_dir and the clip is moved after."""
+        staging_dir = tmp_path / "staging"
+        staging_dir.mkdir()
+        exporter = VideoExporter(
+            Config(input_path=Path("test.mp4"), export_temp_dir=staging_dir)
+        )
+        output_path = tmp_path / "clips" / "clip.mp4"
+        output_path.parent.mkdir()
+
+        with patch(
+            "analyzer.video._run_ffmpeg",
+            side_effect=lambda cmd, **kw: _completed(cmd),
+        ) as mock_run:
+            result = exporter._export_single_clip(
+                Path("input.mp4"), output_path, 10.0, 25.0
+            )
+
+        assert result["success"] is True
+        staging_path = Path(mock_run.call_args[0][0][-1])
+        assert staging_path.parent == staging_dir
+        assert staging_path.name.startswith(".")
+        assert staging_path.name.endswith(".clip.mp4")
+        assert output_path.exists()
+        assert list(staging_dir.iterdir()) == []
+        # Progress is reported under the clip's name, not the staging name
+        assert mock_run.call_args[1]["label"] == "clip.mp4"
+
+    def test_staging_names_are_unique_per_exporter(self, tmp_path):
+        """Test exporters sharing a temp dir never share staging files."""
+        config = Config(input_path=Path("test.mp4"), export_temp_dir=tmp_path)
+        output_path = tmp_path / "clips" / "clip.mp4"
+
+        first = VideoExporter(config)._get_staging_path(output_path)
+        second = VideoExporter(config)._get_staging_path(output_path)
+
+        assert first != second
+
+    def test_export_clips_creates_export_temp_dir(self, tmp_path):
+        """Test a missing export_temp_dir is created before exporting."""
+        staging_dir = tmp_path / "staging" / "nested"
+        exporter = VideoExporter(
+            Config(input_path=Path("test.mp4"), export_temp_dir=staging_dir)
+        )
+        video = tmp_path / "input.mp4"
+        video.write_bytes(b"\0")
+
+        with (
+            patch("analyzer.video.subprocess.run", side_effect=_fake_run),
+            patch("analyzer.video._run_ffmpeg", side_effect=_fake_run),
+        ):
+            summary = exporter.export_clips(_segments(2), video, tmp_path / "clips")
+
+        assert staging_dir.is_dir()
+        assert summary["exported_clips"] == 2
+
+    def test_failed_clip_leaves_no_partial_output(self, exporter, tmp_path):
+        """Test a failed export removes its staged file."""
+        output_path = tmp_path / "clip.mp4"
+
+        def run(cmd, **kwargs):
+            # FFmpeg leaves a truncated file behind before failing
+            Path(cmd[-1]).write_bytes(b"\0")
+            return _completed(cmd, 1, "boom")
+
+        with patch("analyzer.video._run_ffmpeg", side_effect=run):
+            result = exporter._export_single_clip(
+                Path("input.mp4"), output_path, 10.0, 25.0
+            )
+
+        assert result["success"] is False
+        assert list(tmp_path.iterdir()) == []
+
+    def test_stream_copy_seeks_on_input_side(self, exporter, tmp_path):
+        """Test stream copy seeks and stops on the input side."""
+        output_path = tmp_path / "clip.mp4"
+
+        with patch(
+            "analyzer.video._run_ffmpeg",
+            side_effect=lambda cmd, **kw: _completed(cmd),
+        ) as mock_run:
+            result = exporter._try_stream_copy(
+                Path("input.mp4"), output_path, 10.0, 25.0
+            )
+
+        cmd = mock_run.call_args[0][0]
+        assert result["method"] == "stream_copy"
+        assert cmd.index("-ss") < cmd.index("-to") < cmd.index("-i")
+        assert cmd[cmd.index("-movflags") + 1] == "+faststart"
+        assert cmd[cmd.index("-to") + 1] == "25.0"
+        assert "-t" not in cmd
+
+    def test_ffmpeg_commands_are_quiet_and_non_interactive(self, exporter, tmp_path):
+        """Test every export command carries the global FFmpeg flags."""
+        with patch(
+            "analyzer.video._run_ffmpeg",
+            side_effect=lambda cmd, **kw: _completed(cmd),
+        ) as mock_run:
+            exporter._try_stream_copy(
+                Path("input.mp4"), tmp_path / "copy.mp4", 10.0, 25.0
+            )
+            exporter._transcode_to_h264(
+                Path("input.mp4"), tmp_path / "h264.mp4", 10.0, 25.0
+            )
+
+        for call in mock_run.call_args_list:
+            cmd = call[0][0]
+            assert cmd[1:6] == [
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-nostats",
+                "-nostdin",
+            ]
+
+
+class TestVideoExporterProbing:
+    """Test input probing and codec compatibility checks."""
+
+    def test_get_video_info_is_cached(self, exporter, tmp_path):
+        """Test ffprobe runs once per unchanged input file."""
+        video = tmp_path / "input.mp4"
+        video.write_bytes(b"\0")
+
+        with patch(
+            "analyzer.video.subprocess.run", return_value=_probe_output()
+        ) as mock_run:
+            first = exporter.get_video_info(video)
+            second = exporter.get_video_info(video)
+
+        cmd = mock_run.call_args[0][0]
+        assert mock_run.call_count == 1
+        assert first is second
+        assert first["format"]["duration"] == "60.0"
+        assert "-show_entries" in cmd
+        assert "-show_streams" not in cmd
+
+    @pytest.mark.parametrize(
+        "video_codec,audio_codec,expected",
+        [
+            ("h264", "aac", True),
+            ("h264", None, True),
+            ("hevc", "aac", False),
+            ("h264", "opus", False),
+        ],
+    )
+    def test_is_codec_compatible(
+        self, exporter, tmp_path, video_codec, audio_codec, expected
+    ):
+        """Test stream copy compatibility by codec."""
+        video = tmp_path / "input.mp4"
+        video.write_bytes(b"\0")
+
+        with patch(
+            "analyzer.video.subprocess.run",
+            return_value=_probe_output(video_codec, audio_codec),
+        ):
+            compat = exporter.is_codec_compatible(video)
+
+        assert compat["compatible"] is expected
+        assert compat["video_codec"] == video_codec
+        assert compat["audio_codec"] == audio_codec
+
+    def test_video_dimensions_reuse_cached_probe(self, exporter, tmp_path):
+        """Test dimensions come from the cached probe, not a new ffprobe."""
+        video = tmp_path / "input.mp4"
+        video.write_bytes(b"\0")
+
+        with patch(
+            "analyzer.video.subprocess.run", return_value=_probe_output()
+        ) as mock_run:
+            exporter.is_codec_compatible(video)
+            dimensions = exporter._get_video_dimensions(video)
+
+        assert mock_run.call_count == 1
+        assert dimensions == (1280, 720)
+
+    @pytest.mark.parametrize(
+        "audio_codec,sample_rate,expected",
+        [
+            ("aac", 48000, ["-c:a", "copy"]),
+            ("aac", 22050, ["-c:a", "aac", "-b:a", "128k"]),
+            ("mp3", 44100, ["-c:a", "aac", "-b:a", "128k"]),
+        ],
+    )
+    def test_audio_params_copy_standard_aac(
+        self, exporter, tmp_path, audio_codec, sample_rate, expected
+    ):
+        """Test transcodes copy AAC audio at standard sample rates."""
+        video = tmp_path / "input.mp4"
+        video.write_bytes(b"\0")
+
+        with patch(
+            "analyzer.video.subprocess.run",
+            return_value=_probe_output(
+                audio_codec=audio_codec, sample_rate=sample_rate
+            ),
+        ):
+            assert exporter._get_audio_params(video) == expected
+
+    def test_video_dimensions_default_when_probe_fails(self, exporter):
+        """Test unprobeable inputs fall back to 1920x1080."""
+        assert exporter._get_video_dimensions(Path("missing.mp4")) == (1920, 1080)
+
+    def test_is_codec_compatible_when_probe_fails(self, exporter):
+        """Test unprobeable inputs still attempt stream copy."""
+        compat = exporter.is_codec_compatible(Path("missing.mp4"))
+
+        assert compat["compatible"] is True
+
+    def test_get_seek_keyframes_maps_back_to_input_order(self, exporter):
+        """Test keyframes are probed sorted but returned in input order."""
+        with patch(
+            "analyzer.video.subprocess.run",
+            side_effect=lambda cmd, **kw: _keyframe_output(cmd),
+        ) as mock_run:
+            keyframes = exporter._get_seek_keyframes(
+                Path("input.mp4"), [120.0, 30.0, 60.0]
+            )
+
+        cmd = mock_run.call_args[0][0]
+        assert cmd[cmd.index("-read_intervals") + 1] == ("30.0%+#1,60.0%+#1,120.0%+#1")
+        assert keyframes == [119.0, 29.0, 59.0]
+
+    def test_plan_stream_copy_snaps_to_keyframes(self, exporter):
+        """Test copy starts snap to keyframes and distant ones transcode."""
+        segments = _segments(3)["segments"]
+
+        with patch(
+            "analyzer.video.subprocess.run",
+            side_effect=lambda cmd, **kw: _keyframe_output(cmd, drift=2.0),
+        ):
+            exporter.config.keyframe_tolerance = 1.0
+            copy_starts = exporter._plan_stream_copy(Path("input.mp4"), segments)
+
+        # First clip starts at 0s, so its keyframe is at the start
+        assert copy_starts == [0.0, None, None]
+
+        with patch(
+            "analyzer.video.subprocess.run",
+            side_effect=lambda cmd, **kw: _keyframe_output(cmd, drift=2.0),
+        ):
+            exporter.config.keyframe_tolerance = 3.0
+            copy_starts = exporter._plan_stream_copy(Path("input.mp4"), segments)
+
+        assert copy_starts == [0.0, 58.0, 118.0]
+
+    def test_plan_stream_copy_transcodes_keyframe_after_start(self, exporter):
+        """Test a seek landing after the start is not stream copied."""
+        segments = _segments(2)["segments"]
+
+        with patch(
+            "analyzer.video.subprocess.run",
+            side_effect=lambda cmd, **kw: _keyframe_output(cmd, drift=-0.5),
+        ):
+            copy_starts = exporter._plan_stream_copy(Path("input.mp4"), segments)
+
+        assert copy_starts == [None, None]
+
+    def test_plan_stream_copy_uses_container_start_time(self, exporter, tmp_path):
+        """Test keyframes are probed on stream time and returned for -ss."""
+        video = tmp_path / "input.ts"
+        video.write_bytes(b"\0")
+        segments = _segments(3)["segments"][1:]
+
+        def run(cmd, **kwargs):
+            if "-read_intervals" in cmd:
+                return _keyframe_output(cmd)
+            return _probe_output(start_time=1.4)
+
+        with patch("analyzer.video.subprocess.run", side_effect=run) as mock_run:
+            copy_starts = exporter._plan_stream_copy(video, segments)
+
+        cmd = mock_run.call_args[0][0]
+        assert cmd[cmd.index("-read_intervals") + 1] == "61.4%+#1,121.4%+#1"
+        assert copy_starts == [59.0, 119.0]
+
+    def test_plan_stream_copy_when_probe_fails(self, exporter):
+        """Test stream copy is still attempted when keyframes are unknown."""
+        segments = _segments(2)["segments"]
+
+        with patch(
+            "analyzer.video.subprocess.run",
+            side_effect=subprocess.CalledProcessError(1, "ffprobe"),
+        ):
+            copy_starts = exporter._plan_stream_copy(Path("input.mp4"), segments)
+
+        assert copy_starts == [0.0, 60.0]
+
+    def test_incompatible_input_skips_stream_copy(self, exporter, tmp_path):
+        """Test export goes straight to h264 when codecs are incompatible."""
+        output_path = tmp_path / "clip.mp4"
+
+        with patch(
+            "analyzer.video._run_ffmpeg",
+            side_effect=lambda cmd, **kw: _completed(cmd),
+        ) as mock_run:
+            result = exporter._export_single_clip(
+                Path("input.mp4"),
+                output_path,
+                10.0,
+                25.0,
+                stream_copy_compatible=False,
+            )
+
+        assert mock_run.call_count == 1
+        assert result["method"] == "h264_transcode"
+
+
+class TestVideoExporterBatch:
+    """Test export_clips orchestration."""
+
+    def test_export_clips_batches_stream_copies(self, exporter, tmp_path):
+        """Test compatible inputs are stream copied in one FFmpeg process."""
+        video = tmp_path / "input.mp4"
+        video.write_bytes(b"\0")
+
+        with (
+            patch("analyzer.video.subprocess.run", side_effect=_fake_run),
+            patch("analyzer.video._run_ffmpeg", side_effect=_fake_run) as mock_ffmpeg,
+        ):
+            summary = exporter.export_clips(_segments(3), video, tmp_path / "clips")
+
+        cmd = mock_ffmpeg.call_args[0][0]
+        clips = summary["exported_clips_list"]
+        assert mock_ffmpeg.call_count == 1
+        assert cmd.count("-i") == 3
+        assert cmd.count("+faststart") == 3
+        assert summary["exported_clips"] == 3
+        assert [c["export_method"] for c in clips] == ["stream_copy_batch"] * 3
+        # Clips are cut from the keyframe 1s before each start up to the end
+        assert cmd[cmd.index("-ss", cmd.index("-ss") + 1) + 1] == "59.0"
+        assert cmd[cmd.index("-to", cmd.index("-to") + 1) + 1] == "80.0"
+        assert [c["keyframe_snap"] for c in clips] == [0.0, 1.0, 1.0]
+
+    def test_export_clips_bounds_batch_size(self, exporter, tmp_path):
+        """Test large clip lists are split across bounded batches."""
+        video = tmp_path / "input.mp4"
+        video.write_bytes(b"\0")
+        count = STREAM_COPY_BATCH_SIZE + 3
+
+        with (
+            patch("analyzer.video.subprocess.run", side_effect=_fake_run),
+            patch("analyzer.video._run_ffmpeg", side_effect=_fake_run) as mock_ffmpeg,
+        ):
+            summary = exporter.export_clips(_segments(count), video, tmp_path / "clips")
+
+        input_counts = [call[0][0].count("-i") for call in mock_ffmpeg.call_args_list]
+        assert input_counts == [STREAM_COPY_BATCH_SIZE, 3]
+        assert summary["exported_clips"] == count
+
+    def test_export_clips_batches_transcodes_with_one_worker(self, tmp_path):
+        """Test serial transcodes share one FFmpeg process per batch."""
+        exporter = VideoExporter(
+            Config(input_path=Path("test.mp4"), export_format="vertical", threads=2)
+        )
+        video = tmp_path / "input.mp4"
+        video.write_bytes(b"\0")
+
+        with (
+            patch("analyzer.video.subprocess.run", side_effect=_fake_run),
+            patch("analyzer.video._run_ffmpeg", side_effect=_fake_run) as mock_ffmpeg,
+        ):
+            summary = exporter.export_clips(_segments(3), video, tmp_path / "clips")
+
+        cmd = mock_ffmpeg.call_args[0][0]
+        assert mock_ffmpeg.call_count == 1
+        assert cmd.count("-vf") == 3
+        assert cmd.count("-i") == 3
+        # The three concurrent encoders share the two-thread budget
+        thread_counts = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == "-threads"]
+        assert thread_counts == ["1"] * 3
+        assert [c["export_method"] for c in summary["exported_clips_list"]] == [
+            "format_conversion_vertical_batch"
+        ] * 3
+
+    def test_explicit_single_worker_transcodes_clip_by_clip(self, tmp_path):
+        """Test export_parallelism=1 runs one FFmpeg process per transcode."""
+        exporter = VideoExporter(
+            Config(
+                input_path=Path("test.mp4"),
+                export_format="vertical",
+                export_parallelism=1,
+                threads=4,
+            )
+        )
+        video = tmp_path / "input.mp4"
+        video.write_bytes(b"\0")
+
+        with (
+            patch("analyzer.video.subprocess.run", side_effect=_fake_run),
+            patch("analyzer.video._run_ffmpeg", side_effect=_fake_run) as mock_ffmpeg,
+        ):
+            summary = exporter.export_clips(_segments(3), video, tmp_path / "clips")
+
+        assert mock_ffmpeg.call_count == 3
+        assert all(call[0][0].count("-i") == 1 for call in mock_ffmpeg.call_args_list)
+        assert summary["exported_clips"] == 3
+
+    def test_export_clips_copies_source_matching_format(self, tmp_path):
+        """Test a source already at the vertical size is not re-encoded."""
+        exporter = VideoExporter(
+            Config(input_path=Path("test.mp4"), export_format="vertical")
+        )
+        video = tmp_path / "input.mp4"
+        video.write_bytes(b"\0")
+
+        def run(cmd, **kwargs):
+            if cmd[0] == "ffprobe" and "-read_intervals" not in cmd:
+                return _probe_output(width=1080, height=1920)
+            return _fake_run(cmd)
+
+        with (
+            patch("analyzer.video.subprocess.run", side_effect=run),
+            patch("analyzer.video._run_ffmpeg", side_effect=_fake_run) as mock_ffmpeg,
+        ):
+            summary = exporter.export_clips(_segments(2), video, tmp_path / "clips")
+
+        cmd = mock_ffmpeg.call_args[0][0]
+        assert "-vf" not in cmd
+        assert cmd[cmd.index("-c") + 1] == "copy"
+        assert [c["export_method"] for c in summary["exported_clips_list"]] == [
+            "stream_copy_batch"
+        ] * 2
+
+    @pytest.mark.parametrize(
+        "video_fields",
+        [
+            {"side_data_list": [{"rotation": -90}]},
+            {"tags": {"rotate": "90"}},
+            {"sample_aspect_ratio": "4:3"},
+        ],
+    )
+    def test_export_clips_transcodes_rotated_or_anamorphic_source(
+        self, tmp_path, video_fields
+    ):
+        """Test a source at the target size but other display geometry is re-encoded."""
+        exporter = VideoExporter(
+            Config(input_path=Path("test.mp4"), export_format="vertical")
+        )
+        video = tmp_path / "input.mp4"
+        video.write_bytes(b"\0")
+
+        def run(cmd, **kwargs):
+            if cmd[0] == "ffprobe" and "-read_intervals" not in cmd:
+                return _probe_output(width=1080, height=1920, **video_fields)
+            return _fake_run(cmd)
+
+        with (
+            patch("analyzer.video.subprocess.run", side_effect=run),
+            patch("analyzer.video._run_ffmpeg", side_effect=_fake_run) as mock_ffmpeg,
+        ):
+            summary = exporter.export_clips(_segments(2), video, tmp_path / "clips")
+
+        assert "-vf" in mock_ffmpeg.call_args[0][0]
+        assert all(
+            c["export_method"].startswith("format_conversion_vertical")
+            for c in summary["exported_clips_list"]
+        )
+
+    def test_export_clips_reuses_unchanged_clips(self, tmp_path):
+        """Test a repeated export skips clips whose inputs are unchanged."""
+        exporter = VideoExporter(
+            Config(input_path=Path("test.mp4"), reuse_exported_clips=True)
+        )
+        video = tmp_path / "input.mp4"
+        video.write_bytes(b"\0")
+        output_dir = tmp_path / "clips"
+
+        with (
+            patch("analyzer.video.subprocess.run", side_effect=_fake_run),
+            patch("analyzer.video._run_ffmpeg", side_effect=_fake_run) as mock_ffmpeg,
+        ):
+            first = exporter.export_clips(_segments(2), video, output_dir)
+            second = exporter.export_clips(_segments(2), video, output_dir)
+            assert mock_ffmpeg.call_count == 1
+
+            # A modified input invalidates the cached clips
+            video.write_bytes(b"\0\0")
+            os.utime(video, ns=(0, 0))
+            exporter.export_clips(_segments(2), video, output_dir)
+
+        assert mock_ffmpeg.call_count == 2
+        assert second["exported_clips_list"] == first["exported_clips_list"]
+        assert len(list(output_dir.glob("*.meta.json"))) == 2
+
+    def test_export_clips_interrupt_stops_parallel_exports(self, tmp_path):
+        """Test an interrupt during a parallel export cancels pending clips."""
+        exporter = VideoExporter(
+            Config(
+                input_path=Path("test.mp4"),
+                export_format="vertical",
+                export_parallelism=2,
+            )
+        )
+        video = tmp_path / "input.mp4"
+        video.write_bytes(b"\0")
+        both_running = threading.Barrier(2, timeout=5)
+        ffmpeg_calls = []
+
+        def run_ffmpeg(cmd, **kwargs):
+            # Like the real helper, nothing starts once cancelled
+            cancel_event = kwargs["cancel_event"]
+            if cancel_event.is_set():
+                raise KeyboardInterrupt("Operation cancelled")
+            ffmpeg_calls.append(cmd)
+            # Interrupt once both workers run a long transcode
+            if both_running.wait() == 0:
+                exporter.cancel()
+            cancel_event.wait(timeout=5)
+            raise KeyboardInterrupt("Operation cancelled")
+
+        shutdown = ThreadPoolExecutor.shutdown
+        with (
+            patch("analyzer.video.subprocess.run", side_effect=_fake_run),
+            patch("analyzer.video._run_ffmpeg", side_effect=run_ffmpeg),
+            patch.object(
+                ThreadPoolExecutor, "shutdown", autospec=True, side_effect=shutdown
+            ) as mock_shutdown,
+            pytest.raises(KeyboardInterrupt),
+        ):
+            exporter.export_clips(_segments(4), video, tmp_path / "clips")
+
+        assert exporter.cancel_event.is_set()
+        # Pending clips were cancelled, none started after the interrupt
+        assert mock_shutdown.call_args_list[0][1] == {"cancel_futures": True}
+        assert len(ffmpeg_calls) == 2
+
+    def test_export_clips_runs_again_after_cancel(self, exporter, tmp_path):
+        """Test a cancelled exporter can start a new export."""
+        video = tmp_path / "input.mp4"
+        video.write_bytes(b"\0")
+        exporter.cancel()
+
+        with (
+            patch("analyzer.video.subprocess.run", side_effect=_fake_run),
+            patch("analyzer.video._run_ffmpeg", side_effect=_fake_run),
+        ):
+            summary = exporter.export_clips(_segments(2), video, tmp_path / "clips")
+
+        assert summary["exported_clips"] == 2
+
+    def test_export_clips_parallel_keeps_segment_order(self, tmp_path):
+        """Test per-clip fallback reports clips in segment order."""
+        exporter = VideoExporter(
+            Config(input_path=Path("test.mp4"), export_parallelism=4)
+        )
+        video = tmp_path / "input.mp4"
+        video.write_bytes(b"\0")
+
+        def run(cmd, **kwargs):
+            # Fail the batch invocation, succeed for single clips
+            if cmd.count("-i") > 1:
+                return _completed(cmd, 1, "batch failed")
+            return _completed(cmd)
+
+        with (
+            patch("analyzer.video.subprocess.run", side_effect=_fake_run),
+            patch("analyzer.video._run_ffmpeg", side_effect=run),
+        ):
+            summary = exporter.export_clips(_segments(6), video, tmp_path / "clips")
+
+        assert summary["total_clips"] == 6
+        assert summary["exported_clips"] == 6
+        assert summary["failed_clips"] == 0
+        assert [c["clip_id"] for c in summary["exported_clips_list"]] == list(range(6))
+        assert all(
+            c["export_method"] == "stream_copy" for c in summary["exported_clips_list"]
+        )
+
+    def test_export_workers_split_cpu_budget(self):
+        """Test worker count and FFmpeg threads respect the CPU budget."""
+        exporter = VideoExporter(Config(input_path=Path("test.mp4"), threads=8))
+
+        assert exporter._get_export_workers(2) == 2
+        assert exporter._get_export_workers(10) == 4
+        assert exporter._get_export_workers(0) == 1
+
+    @pytest.mark.skipif(
+        not hasattr(os, "sched_getaffinity"), reason="Linux CPU affinity"
+    )
+    def test_worker_core_sets_split_cores_contiguously(self):
+        """Test pinned workers get disjoint contiguous core ranges."""
+        exporter = VideoExporter(
+            Config(input_path=Path("test.mp4"), pin_export_workers=True, threads=8)
+        )
+
+        with patch("analyzer.video.os.sched_getaffinity", return_value=set(range(12))):
+            core_sets = exporter._get_worker_core_sets(3)
+
+        # Only the 8 cores of the thread budget are handed out
+        assert core_sets == [[0, 1], [2, 3, 4], [5, 6, 7]]
+
+    @pytest.mark.skipif(
+        not hasattr(os, "sched_setaffinity"), reason="Linux CPU affinity"
+    )
+    def test_pinned_workers_pin_their_own_thread(self, tmp_path):
+        """Test workers pin themselves before spawning any FFmpeg."""
+        exporter = VideoExporter(
+            Config(
+                input_path=Path("test.mp4"),
+                export_format="vertical",
+                export_parallelism=2,
+                pin_export_workers=True,
+            )
+        )
+        video = tmp_path / "input.mp4"
+        video.write_bytes(b"\0")
+        core_sets = [[0], [1]]
+        events = []
+
+        def set_affinity(pid, cores):
+            events.append(("pin", pid, list(cores)))
+
+        def run_ffmpeg(cmd, **kwargs):
+            events.append(("ffmpeg",))
+            return _completed(cmd)
+
+        with (
+            patch.object(exporter, "_get_worker_core_sets", return_value=core_sets),
+            patch("analyzer.video.os.sched_setaffinity", side_effect=set_affinity),
+            patch("analyzer.video.subprocess.run", side_effect=_fake_run),
+            patch("analyzer.video._run_ffmpeg", side_effect=run_ffmpeg),
+        ):
+            summary = exporter.export_clips(_segments(4), video, tmp_path / "clips")
+
+        pins = [event for event in events if event[0] == "pin"]
+        assert summary["exported_clips"] == 4
+        # The calling thread (pid 0) is pinned, never an FFmpeg child by PID
+        assert sorted(pins) == [("pin", 0, [0]), ("pin", 0, [1])]
+        assert events[0][0] == "pin"
+
+    def test_worker_core_sets_disabled_by_default(self, exporter):
+        """Test workers are not pinned unless requested."""
+        assert exporter._get_worker_core_sets(4) == []
+
+
+class TestVideoExporterEncoder:
+    """Test h264 encoder selection and settings."""
+
+    def test_x264_preset_and_tune_from_config(self):
+        """Test libx264 preset and tune come from the config."""
+        exporter = VideoExporter(
+            Config(
+                input_path=Path("test.mp4"),
+                x264_preset="ultrafast",
+                x264_tune="fastdecode",
+            )
+        )
+
+        params = exporter.h264_params
+        assert params[params.index("-preset") + 1] == "ultrafast"
+        assert params[params.index("-tune") + 1] == "fastdecode"
+
+    def test_x264_defaults_keep_veryfast_without_tune(self, exporter):
+        """Test the default libx264 settings are unchanged."""
+        params = exporter.h264_params
+        assert params[params.index("-preset") + 1] == "veryfast"
+        assert "-tune" not in params
+
+    def test_invalid_x264_preset_is_rejected(self):
+        """Test unknown presets fail config validation."""
+        with pytest.raises(ValueError):
+            Config(input_path=Path("test.mp4"), x264_preset="warp")
+
+
+class TestVideoExporterNvenc:
+    """Test the optional NVENC hardware encoding path."""
+
+    def test_nvenc_used_when_requested_and_available(self, tmp_path):
+        """Test h264 transcoding switches to NVENC with CUDA decoding."""
+        with patch("analyzer.video._detect_nvenc", return_value=True):
+            exporter = VideoExporter(
+                Config(input_path=Path("test.mp4"), use_nvenc=True)
+            )
+
+        with patch(
+            "analyzer.video._run_ffmpeg",
+            side_effect=lambda cmd, **kw: _completed(cmd),
+        ) as mock_run:
+            exporter._transcode_to_h264(
+                Path("input.mp4"), tmp_path / "clip.mp4", 10.0, 25.0
+            )
+
+        cmd = mock_run.call_args[0][0]
+        assert exporter.use_nvenc is True
+        assert cmd[cmd.index("-c:v") + 1] == "h264_nvenc"
+        assert cmd.index("-hwaccel") < cmd.index("-i")
+
+    def test_nvenc_caps_default_export_workers(self):
+        """Test NVENC limits automatic parallelism to a few encode sessions."""
+        with patch("analyzer.video._detect_nvenc", return_value=True):
+            exporter = VideoExporter(
+                Config(input_path=Path("test.mp4"), use_nvenc=True, threads=16)
+            )
+
+        assert exporter._get_export_workers(10) == NVENC_MAX_WORKERS
+
+        exporter.config.export_parallelism = 4
+        assert exporter._get_export_workers(10) == 4
+
+    def test_nvenc_bounds_transcode_batch_size(self, tmp_path):
+        """Test batched NVENC transcodes open few encode sessions per process."""
+        with patch("analyzer.video._detect_nvenc", return_value=True):
+            exporter = VideoExporter(
+                Config(
+                    input_path=Path("test.mp4"),
+                    export_format="vertical",
+                    use_nvenc=True,
+                    threads=2,
+                )
+            )
+        video = tmp_path / "input.mp4"
+        video.write_bytes(b"\0")
+
+        with (
+            patch("analyzer.video.subprocess.run", side_effect=_fake_run),
+            patch("analyzer.video._run_ffmpeg", side_effect=_fake_run) as mock_ffmpeg,
+        ):
+            summary = exporter.export_clips(_segments(5), video, tmp_path / "clips")
+
+        encoder_counts = [
+            call[0][0].count("h264_nvenc") for call in mock_ffmpeg.call_args_list
+        ]
+        assert encoder_counts == [NVENC_MAX_WORKERS, NVENC_MAX_WORKERS, 1]
+        assert summary["exported_clips"] == 5
+
+    def test_nvenc_decodes_format_conversion_on_gpu(self, tmp_path):
+        """Test cropped exports decode with CUDA into system memory frames."""
+        with patch("analyzer.video._detect_nvenc", return_value=True):
+            exporter = VideoExporter(
+                Config(
+                    input_path=Path("test.mp4"),
+                    export_format="vertical",
+                    use_nvenc=True,
+                )
+            )
+
+        with patch(
+            "analyzer.video._run_ffmpeg",
+            side_effect=lambda cmd, **kw: _completed(cmd),
+        ) as mock_run:
+            exporter._transcode_with_format(
+                Path("input.mp4"), tmp_path / "clip_vertical.mp4", 10.0, 25.0
+            )
+
+        cmd = mock_run.call_args[0][0]
+        assert cmd[cmd.index("-hwaccel") + 1] == "cuda"
+        assert cmd.index("-hwaccel") < cmd.index("-i")
+        assert "-hwaccel_output_format" not in cmd
+
+    def test_nvenc_scales_format_conversion_on_gpu(self):
+        """Test format conversion uploads cropped frames and scales on GPU."""
+        with patch("analyzer.video._detect_nvenc", return_value=True):
+            exporter = VideoExporter(
+                Config(
+                    input_path=Path("test.mp4"),
+                    export_format="vertical",
+                    use_nvenc=True,
+                )
+            )
+
+        crop_scale_filter = exporter._build_crop_scale_filter(
+            exporter.formats["vertical"]
+        )
+
+        assert crop_scale_filter == "crop=ih*9/16:ih,hwupload_cuda,scale_cuda=1080:1920"
+
+    def test_nvenc_preset_and_quality_from_config(self):
+        """Test NVENC preset and constant quality come from the config."""
+        with patch("analyzer.video._detect_nvenc", return_value=True):
+            exporter = VideoExporter(
+                Config(
+                    input_path=Path("test.mp4"),
+                    use_nvenc=True,
+                    nvenc_preset="p1",
+                    nvenc_cq=28,
+                )
+            )
+
+        params = exporter.h264_params
+        assert params[params.index("-preset") + 1] == "p1"
+        assert params[params.index("-cq") + 1] == "28"
+        assert params[params.index("-bf") + 1] == "0"
+
+    def test_nvenc_falls_back_to_libx264_when_unavailable(self):
+        """Test libx264 is kept when h264_nvenc is missing."""
+        with patch("analyzer.video._detect_nvenc", return_value=False):
+            exporter = VideoExporter(
+                Config(input_path=Path("test.mp4"), use_nvenc=True)
+            )
+
+        assert exporter.use_nvenc is False
+        assert exporter.hwaccel_params == []
+        assert exporter.h264_params[1] == "libx264"
+
+    @pytest.mark.parametrize("returncode,expected", [(0, True), (1, False)])
+    def test_detect_nvenc_runs_test_encode(self, returncode, expected):
+        """Test NVENC is only used when a test encode succeeds."""
+        _detect_nvenc.cache_clear()
+        try:
+            with patch(
+                "analyzer.video.subprocess.run",
+                return_value=subprocess.CompletedProcess(
+                    [], returncode, stdout="", stderr="No NVENC capable devices"
+                ),
+            ) as mock_run:
+                assert _detect_nvenc() is expected
+        finally:
+            _detect_nvenc.cache_clear()
+
+        cmd = mock_run.call_args[0][0]
+        assert cmd[cmd.index("-c:v") + 1] == "h264_nvenc"
+        assert cmd[cmd.index("-frames:v") + 1] == "1"
+
+
+class TestRunFfmpeg:
+    """Test the FFmpeg subprocess runner."""
+
+    def test_run_ffmpeg_keeps_stderr_tail_on_failure(self):
+        """Test stderr is bounded and decoded only when the command fails."""
+        script = (
+            "import sys\n"
+            "for i in range(1000):\n"
+            "    print(f'line {i}', file=sys.stderr)\n"
+            "sys.exit(3)"
+        )
+
+        result = _run_ffmpeg([sys.executable, "-c", script], timeout=30)
+
+        lines = result.stderr.splitlines()
+        assert result.returncode == 3
+        assert len(lines) == STDERR_TAIL_LINES
+        assert lines[-1] == "line 999"
+
+    def test_run_ffmpeg_discards_stderr_on_success(self):
+        """Test successful runs do not return stderr."""
+        script = "import sys; print('noise', file=sys.stderr)"
+
+        result = _run_ffmpeg([sys.executable, "-c", script], timeout=30)
+
+        assert result.returncode == 0
+        assert result.stderr == ""
+
+    def test_run_ffmpeg_kills_on_timeout(self):
+        """Test the process is killed when the timeout expires."""
+        script = "import time; time.sleep(30)"
+
+        with pytest.raises(subprocess.TimeoutExpired):
+            _run_ffmpeg([sys.executable, "-c", script], timeout=0.5)
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX process groups")
+    def test_run_ffmpeg_kills_process_group_on_timeout(self, tmp_path):
+        """Test children of the FFmpeg process are killed with it."""
+        pid_file = tmp_path / "child.pid"
+        script = (
+            "import subprocess, sys, time\n"
+            "child = subprocess.Popen([sys.executable, '-c', "
+            "'import time; time.sleep(30)'])\n"
+            f"open({str(pid_file)!r}, 'w').write(str(child.pid))\n"
+            "time.sleep(30)"
+        )
+
+        with pytest.raises(subprocess.TimeoutExpired):
+            _run_ffmpeg([sys.executable, "-c", script], timeout=2)
+
+        # On a slow runner the timeout may hit before the child is started
+        child_pid_text = pid_file.read_text() if pid_file.exists() else ""
+        if not child_pid_text:
+            pytest.skip("child process was not started before the timeout")
+        child_pid = int(child_pid_text)
+        for _ in range(50):
+            try:
+                os.kill(child_pid, 0)
+            except ProcessLookupError:
+                break
+            time.sleep(0.1)
+        else:
+            pytest.fail("child process survived the timeout")
+
+    def test_run_ffmpeg_logs_command_only_at_debug(self, caplog):
+        """Test the command line is quoted into the log only when debugging."""
+        cmd = [sys.executable, "-c", "pass"]
+
+        with caplog.at_level(logging.INFO, logger="analyzer.video"):
+            _run_ffmpeg(cmd, timeout=30)
+        assert "Running FFmpeg command" not in caplog.text
+
+        with caplog.at_level(logging.DEBUG, logger="analyzer.video"):
+            _run_ffmpeg(cmd, timeout=30)
+        assert "-c pass" in caplog.text
+
+    def test_run_ffmpeg_stops_when_cancelled(self):
+        """Test setting the cancel event kills FFmpeg and raises."""
+        cancel_event = threading.Event()
+        threading.Timer(0.3, cancel_event.set).start()
+        started = time.monotonic()
+
+        with pytest.raises(KeyboardInterrupt):
+            _run_ffmpeg(
+                [sys.executable, "-c", "import time; time.sleep(30)"],
+                timeout=30,
+                cancel_event=cancel_event,
+            )
+
+        assert time.monotonic() - started < 10
+
+    def test_run_ffmpeg_logs_progress(self, caplog):
+        """Test -progress reports are logged as percent of the duration."""
+        script = "print('out_time_us=5000000'); print('progress=end')"
+
+        with caplog.at_level(logging.INFO, logger="analyzer.video"):
+            _run_ffmpeg(
+                [sys.executable, "-c", script, "clip.mp4"], timeout=30, duration=10.0
+            )
+
+        assert "clip.mp4: 50% exported" in caplog.text
+
+    def test_run_ffmpeg_logs_progress_under_label(self, caplog):
+        """Test progress reports use the given label instead of the output."""
+        script = "print('out_time_us=5000000'); print('progress=end')"
+
+        with caplog.at_level(logging.INFO, logger="analyzer.video"):
+            _run_ffmpeg(
+                [sys.executable, "-c", script, ".a1b2c3.clip.mp4"],
+                timeout=30,
+                duration=10.0,
+                label="clip.mp4",
+            )
+
+        assert "clip.mp4: 50% exported" in caplog.text
+        assert ".a1b2c3" not in caplog.text